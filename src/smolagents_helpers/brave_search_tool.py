@@ -1,9 +1,93 @@
 import os
+import re
+import asyncio
 import json
+import tempfile
+import threading
+import time
+import httpx
 import requests
-from typing import Dict, List, Any, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Dict, Hashable, Iterable, List, Any, Optional, Tuple, Union
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from urllib3.util.retry import Retry
 from smolagents.tools import Tool
 
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "speedups" extra
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import ijson  # type: ignore[import-untyped]
+except ImportError:  # optional, only needed for stream_results=True
+    ijson = None
+
+# Brave wraps matched query terms in <strong> tags inside snippets
+_STRONG_TAG_RE = re.compile(r"</?strong>")
+
+# Exceptions raised when a response body is not the JSON we expect
+_DECODE_ERRORS = (ValueError,) if ijson is None else (ValueError, ijson.JSONError)
+
+
+def _stdlib_json_dumps(obj: Any) -> bytes:
+    """Encode an object as UTF-8 JSON bytes with the standard library."""
+    return json.dumps(obj).encode("utf-8")
+
+
+# Pick the codec once at import so every call is a direct C-function call
+# rather than re-checking which backend is available
+if orjson is not None:
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+else:
+    _json_loads = json.loads
+    _json_dumps = _stdlib_json_dumps
+
+
+class _TTLCache:
+    """Small thread-safe LRU cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at >= self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Locks cannot be pickled; a copy starts with an empty cache
+        return {"maxsize": self.maxsize, "ttl": self.ttl}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        _TTLCache.__init__(self, state["maxsize"], state["ttl"])
+
 
 class BraveSearchTool(Tool):
     """Tool for interacting with the Brave Search API within the smolagents framework."""
@@ -34,17 +118,151 @@ class BraveSearchTool(Tool):
     }
     output_type = "array"
 
-    def __init__(self, api_key: Optional[str] = None):
+    REQUEST_TIMEOUT = (3.05, 10)  # (connect, read) seconds
+    DEFAULT_CACHE_TTL = 300  # Seconds a formatted result list stays reusable
+    DEFAULT_CACHE_MAXSIZE = 256
+    MAX_BATCH_WORKERS = 8
+    # Resolved once at import rather than on every construction
+    CONFIG_PATH = os.path.expanduser("~/.config/brave_search_tool.json")
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        cache_maxsize: int = DEFAULT_CACHE_MAXSIZE,
+        stream_results: bool = False,
+        transport: str = "requests",
+        max_desc_len: Optional[int] = None,
+    ):
         """Initialize the Brave Search tool.
 
         Args:
             api_key: Optional API key for Brave Search. If not provided, will try to load from
                      config file or environment variable.
+            cache_ttl: Seconds an identical search is answered from memory.
+            cache_maxsize: Maximum number of cached searches (0 disables the cache).
+            stream_results: Parse `web.results` incrementally from the socket with
+                     ijson instead of buffering the whole body (sync `forward` only).
+            transport: "requests" (default) or "httpx". The httpx transport speaks
+                     HTTP/2, so concurrent searches (see `batch_forward`) are
+                     multiplexed over a single connection.
+            max_desc_len: When set, strip <strong> highlighting from descriptions
+                     and cut them to at most this many characters, keeping the
+                     text handed to the model short. None returns them unchanged.
         """
+        if transport not in ("requests", "httpx"):
+            raise ValueError(f"Unsupported transport: {transport!r}")
+        if stream_results and ijson is None:
+            raise ImportError("stream_results=True requires the 'ijson' package")
+        if stream_results and transport != "requests":
+            raise ValueError(
+                "stream_results is only supported with transport='requests'"
+            )
         super().__init__()
         self.api_endpoint = "https://api.search.brave.com/res/v1/web/search"
-        self.config_path = os.path.expanduser("~/.config/brave_search_tool.json")
+        self.config_path = self.CONFIG_PATH
+        self._stored_key: Optional[str] = None  # Key last read from/written to disk
         self.api_key = api_key or self._load_api_key()
+        self.transport = transport
+        self._open_clients()
+        self._cache = _TTLCache(maxsize=cache_maxsize, ttl=cache_ttl)
+        self.stream_results = stream_results
+        self.max_desc_len = max_desc_len
+
+    @property
+    def api_key(self) -> Optional[str]:
+        return self._api_key
+
+    @api_key.setter
+    def api_key(self, api_key: Optional[str]) -> None:
+        # Request headers and the key check only change with the key, so
+        # derive them once here instead of on every search
+        self._api_key = api_key
+        self._have_key = bool(api_key)
+        self._base_headers = {
+            "Accept": "application/json",
+            "X-Subscription-Token": api_key or "",
+        }
+
+    # Connection pools are process-local; they are dropped when pickling and
+    # reopened on unpickling so tool instances can cross process boundaries
+    _CLIENT_ATTRS = ("_session", "_hclient", "_aclient")
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        for attr in self._CLIENT_ATTRS:
+            state.pop(attr, None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._open_clients()
+
+    def _open_clients(self) -> None:
+        """Create the HTTP clients for the configured transport."""
+        self._session = self._build_session()
+        self._aclient: Optional[httpx.AsyncClient] = None
+        self._hclient: Optional[httpx.Client] = None
+        if self.transport == "httpx":
+            self._hclient = httpx.Client(
+                http2=True,
+                timeout=httpx.Timeout(10.0, connect=3.0),
+                limits=httpx.Limits(max_keepalive_connections=8),
+            )
+
+    def _build_session(self) -> requests.Session:
+        """Create a pooled session so repeated searches reuse the HTTPS connection."""
+        session = requests.Session()
+        retries = Retry(
+            total=2,
+            backoff_factor=0.2,
+            status_forcelist=[429, 500, 502, 503, 504],
+        )
+        session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries),
+        )
+        return session
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Lazily create the HTTP/2 client used by `aforward`."""
+        if self._aclient is None:
+            self._aclient = httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(10.0, connect=3.0),
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+            )
+        return self._aclient
+
+    def close(self) -> None:
+        """Release the pooled HTTP connections held by this tool."""
+        self._session.close()
+        if self._hclient is not None:
+            self._hclient.close()
+
+    async def aclose(self) -> None:
+        """Release the async client created by `aforward`, if any."""
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+
+    def clear_cache(self) -> None:
+        """Drop all in-memory search results."""
+        self._cache.clear()
+
+    def _cached(self, key: Hashable) -> Optional[List[Dict[str, str]]]:
+        """Return a copy of cached results so callers cannot mutate the cache."""
+        results = self._cache.get(key)
+        if results is None:
+            return None
+        return [dict(item) for item in results]
+
+    def _store(
+        self, key: Hashable, results: List[Dict[str, str]]
+    ) -> List[Dict[str, str]]:
+        """Cache freshly formatted results and hand the caller its own copy."""
+        self._cache.set(key, results)
+        return [dict(item) for item in results]
 
     def _load_api_key(self) -> Optional[str]:
         """Load API key from config file or environment variable."""
@@ -53,16 +271,15 @@ class BraveSearchTool(Tool):
         if api_key:
             return api_key
 
-        # Then check config file
-        if os.path.exists(self.config_path):
-            try:
-                with open(self.config_path, "r") as f:
-                    config = json.load(f)
-                    return config.get("api_key")
-            except (json.JSONDecodeError, IOError):
-                pass
-
-        return None
+        # Then check config file; a missing file is just an OSError here,
+        # which saves a separate existence check
+        try:
+            with open(self.config_path, "rb") as f:
+                config = _json_loads(f.read())
+                self._stored_key = config.get("api_key")
+                return self._stored_key
+        except (ValueError, OSError):
+            return None
 
     def configure(self, api_key: str) -> bool:
         """Configure the tool with a new API key.
@@ -74,11 +291,32 @@ class BraveSearchTool(Tool):
             bool: True if configuration was successful
         """
         self.api_key = api_key
-        os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
+        if api_key == self._stored_key:
+            return True  # The config file already holds this key
 
-        with open(self.config_path, "w") as f:
-            json.dump({"api_key": api_key}, f)
+        config_dir = os.path.dirname(self.config_path)
+        os.makedirs(config_dir, exist_ok=True)
 
+        # Write a private (mkstemp creates it 0600), uniquely named temp file
+        # next to the config and swap it in once it is on disk, so neither a
+        # crash nor a concurrent configure() leaves a truncated file behind
+        fd, tmp_path = tempfile.mkstemp(
+            dir=config_dir, prefix=os.path.basename(self.config_path), suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_json_dumps({"api_key": api_key}))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.config_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        self._stored_key = api_key
         return True
 
     def forward(
@@ -100,27 +338,204 @@ class BraveSearchTool(Tool):
             ValueError: If API key is not configured
             RuntimeError: If the API request fails
         """
-        if not self.api_key:
+        if not self._have_key:
             raise ValueError(
                 "API key not configured. Use the configure() method first."
             )
 
-        headers = {"Accept": "application/json", "X-Subscription-Token": self.api_key}
+        count = count if count < 20 else 20  # API limit is 20
+        cache_key = (query, count, country, search_lang)
+        cached = self._cached(cache_key)
+        if cached is not None:
+            return cached
 
-        params = {
+        params: Dict[str, Any] = {
             "q": query,
-            "count": min(count, 20),  # API limit is 20
+            "count": count,
             "country": country,
             "search_lang": search_lang,
+            "result_filter": "web",  # Only the section format_results reads
         }
 
         try:
-            response = requests.get(self.api_endpoint, headers=headers, params=params)
+            if self._hclient is not None:
+                hresponse = self._hclient.get(
+                    self.api_endpoint, headers=self._base_headers, params=params
+                )
+                hresponse.raise_for_status()
+                results = self._parse_body(hresponse.content)
+                return self._store(cache_key, results)
+
+            response = self._session.get(
+                self.api_endpoint,
+                headers=self._base_headers,
+                params=params,
+                timeout=self.REQUEST_TIMEOUT,
+                stream=True,  # Body is read straight from urllib3 below
+            )
+            with response:
+                response.raise_for_status()
+                if self.stream_results:
+                    # Decode gzip/br on the fly and build one result at a time
+                    response.raw.decode_content = True
+                    results = self._format_items(
+                        ijson.items(response.raw, "web.results.item")
+                    )
+                else:
+                    # One read of the decoded bytes, skipping requests'
+                    # chunked iter_content join and any charset handling
+                    results = self._parse_body(response.raw.read(decode_content=True))
+        except (requests.RequestException, Urllib3HTTPError, httpx.HTTPError) as e:
+            raise RuntimeError(f"Search request failed: {str(e)}")
+        except _DECODE_ERRORS as e:
+            raise RuntimeError(f"Failed to decode search response: {str(e)}")
+
+        return self._store(cache_key, results)
+
+    def batch_forward(
+        self, queries: List[str], **kwargs: Any
+    ) -> List[List[Dict[str, str]]]:
+        """
+        Run several searches concurrently and return their results in query order.
+
+        With transport="httpx" the requests travel as parallel HTTP/2 streams
+        over one connection; with requests they share the pooled Session.
+
+        Args:
+            queries: The search query texts
+            **kwargs: Extra `forward` arguments (count, country, search_lang)
+
+        Returns:
+            One list of formatted search result entries per query
+
+        Raises:
+            ValueError: If API key is not configured
+            RuntimeError: If any of the API requests fails
+        """
+        if not queries:
+            return []
+        workers = min(len(queries), self.MAX_BATCH_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda q: self.forward(q, **kwargs), queries))
+
+    def forward_many(
+        self,
+        queries: List[str],
+        max_workers: int = MAX_BATCH_WORKERS,
+        **kwargs: Any,
+    ) -> List[Tuple[str, Union[List[Dict[str, str]], Exception]]]:
+        """
+        Run several searches concurrently, collecting failures instead of raising.
+
+        Unlike `batch_forward`, one failed search does not abort the batch:
+        each query is paired with either its results or the exception it raised.
+
+        Args:
+            queries: The search query texts
+            max_workers: Upper bound on concurrent requests
+            **kwargs: Extra `forward` arguments (count, country, search_lang)
+
+        Returns:
+            One (query, results_or_exception) tuple per query, in query order
+        """
+        if not queries:
+            return []
+
+        def run(query: str) -> Union[List[Dict[str, str]], Exception]:
+            try:
+                return self.forward(query, **kwargs)
+            except Exception as e:
+                return e
+
+        workers = min(len(queries), max_workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(zip(queries, executor.map(run, queries)))
+
+    async def aforward(
+        self, query: str, count: int = 10, country: str = "US", search_lang: str = "en"
+    ) -> List[Dict[str, str]]:
+        """
+        Async variant of `forward`, so several searches can run concurrently
+        (e.g. with `asyncio.gather`) over a shared HTTP/2 connection.
+
+        Args:
+            query: The search query text
+            count: Number of results to return (max 20)
+            country: Country code for search results
+            search_lang: Language for search results
+
+        Returns:
+            List of formatted search result entries
+
+        Raises:
+            ValueError: If API key is not configured
+            RuntimeError: If the API request fails
+        """
+        if not self._have_key:
+            raise ValueError(
+                "API key not configured. Use the configure() method first."
+            )
+
+        count = count if count < 20 else 20  # API limit is 20
+        cache_key = (query, count, country, search_lang)
+        cached = self._cached(cache_key)
+        if cached is not None:
+            return cached
+
+        params: Dict[str, Any] = {
+            "q": query,
+            "count": count,
+            "country": country,
+            "search_lang": search_lang,
+            "result_filter": "web",  # Only the section format_results reads
+        }
+
+        try:
+            response = await self._get_async_client().get(
+                self.api_endpoint,
+                headers=self._base_headers,
+                params=params,
+            )
             response.raise_for_status()
-            results = response.json()
-            return self.format_results(results)
-        except requests.RequestException as e:
+            results = self._parse_body(response.content)
+        except httpx.HTTPError as e:
             raise RuntimeError(f"Search request failed: {str(e)}")
+        except ValueError as e:
+            raise RuntimeError(f"Failed to decode search response: {str(e)}")
+
+        return self._store(cache_key, results)
+
+    async def aforward_sync(self, *args: Any, **kwargs: Any) -> List[Dict[str, str]]:
+        """
+        Run the synchronous `forward` in a worker thread without blocking the loop.
+
+        This is a compatibility fallback for callers that must keep the
+        requests transport (e.g. for `stream_results`); prefer `aforward`,
+        which is natively async, whenever possible.
+
+        Args:
+            *args: Positional `forward` arguments
+            **kwargs: Keyword `forward` arguments
+
+        Returns:
+            List of formatted search result entries
+        """
+        return await asyncio.to_thread(self.forward, *args, **kwargs)
+
+    def _parse_body(self, body: bytes) -> List[Dict[str, str]]:
+        """Decode a buffered response body and format its web results."""
+        # A substring scan over the raw bytes is far cheaper than a full
+        # parse, and a JSON object without a "web" section has nothing to
+        # format. Anything else (an HTML error page, a truncated body) still
+        # goes through the decoder so it raises instead of reading as "no results".
+        # lstrip/rstrip return an unpadded body itself, so nothing is copied
+        if (
+            body.lstrip()[:1] == b"{"
+            and body.rstrip()[-1:] == b"}"
+            and b'"web"' not in body
+        ):
+            return []
+        return self.format_results(_json_loads(body))
 
     def format_results(self, results: Dict[str, Any]) -> List[Dict[str, str]]:
         """Format raw API results into a more readable structure.
@@ -131,18 +546,32 @@ class BraveSearchTool(Tool):
         Returns:
             List of formatted search result entries
         """
-        formatted = []
-
-        if "web" not in results or "results" not in results["web"]:
+        # Error bodies and empty searches have no (or an empty) web section;
+        # bail out on those before building anything
+        web = results.get("web") if isinstance(results, dict) else None
+        if not web:
+            return []
+        items = web.get("results")
+        if not items:
             return []
 
-        for item in results["web"]["results"]:
-            formatted.append(
-                {
-                    "title": item.get("title", ""),
-                    "url": item.get("url", ""),
-                    "description": item.get("description", ""),
-                }
-            )
+        return self._format_items(items)
+
+    def _format_items(self, items: Iterable[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """Project raw `web.results` entries onto the fields the tool returns."""
+        formatted = [
+            {
+                "title": item.get("title") or "",
+                "url": item.get("url") or "",
+                "description": item.get("description") or "",
+            }
+            for item in items
+        ]
+
+        max_len = self.max_desc_len
+        if max_len is not None:
+            for entry in formatted:
+                description = _STRONG_TAG_RE.sub("", entry["description"])
+                entry["description"] = description[:max_len]
 
         return formatted
@@ -1,17 +1,612 @@
 import os
+import codecs
+import copy
+import functools
 import hashlib
+import httpx
+import itertools
 import json
 import logging
 import requests
 import re
+import sqlite3
+import threading
 import time
-from typing import List, Dict, Optional, Any
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+from urllib.parse import urlsplit
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "speedups" extra
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import ijson  # type: ignore[import-untyped]
+except ImportError:  # optional speedup, see the "speedups" extra
+    ijson = None
+
+try:
+    import zstandard
+except ImportError:  # optional speedup, see the "speedups" extra
+    zstandard = None  # type: ignore[assignment]
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
 
+# Exceptions raised when a SPARQL response body is not the JSON we expect
+_DECODE_ERRORS = (ValueError,) if ijson is None else (ValueError, ijson.JSONError)
+
+
+def _stdlib_json_dumps(obj: Any) -> bytes:
+    """Encode an object as UTF-8 JSON bytes with the standard library."""
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+# JSON codec for responses and cache payloads, picked once at import. Both
+# variants decode UTF-8 bytes directly and raise ValueError subclasses.
+if orjson is not None:
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+else:
+    _json_loads = json.loads
+    _json_dumps = _stdlib_json_dumps
+
+# Every zstd frame starts with this magic number, which lets cached payloads
+# written with and without compression coexist in the same database
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+# Errors meaning a stored payload cannot be decoded (UnicodeDecodeError and
+# json.JSONDecodeError are both ValueErrors)
+_CORRUPT_PAYLOAD_ERRORS = (ValueError,) + (
+    (zstandard.ZstdError,) if zstandard is not None else ()
+)
+# zstd (de)compression contexts are not thread-safe, so keep one per thread
+_zstd_local = threading.local()
+
+
+def _compress_payload(data: bytes) -> bytes:
+    """Compress a cache payload with zstd when available, else return it as is."""
+    if zstandard is None:
+        return data
+    compressor = getattr(_zstd_local, "compressor", None)
+    if compressor is None:
+        compressor = _zstd_local.compressor = zstandard.ZstdCompressor(level=3)
+    return compressor.compress(data)
+
+
+def _decompress_payload(data: bytes) -> bytes:
+    """Undo `_compress_payload`, passing uncompressed payloads through."""
+    if not data.startswith(_ZSTD_MAGIC):
+        return data
+    if zstandard is None:
+        raise ValueError("Cache entry is zstd-compressed but zstandard is missing")
+    decompressor = getattr(_zstd_local, "decompressor", None)
+    if decompressor is None:
+        decompressor = _zstd_local.decompressor = zstandard.ZstdDecompressor()
+    return decompressor.decompress(data)
+
+
+def _zstd_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Compress a stream of chunks into a single zstd frame as it goes."""
+    compressor = zstandard.ZstdCompressor(level=3).compressobj()
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+# The O_TMPFILE fast path names its file through /proc, so it needs both
+_CAN_LINK_TMPFILE = hasattr(os, "O_TMPFILE") and os.path.isdir("/proc/self/fd")
+
+
+def _write_tmpfile_and_link(path: str, chunks: Iterable[bytes]) -> bool:
+    """
+    Linux fast path of `_atomic_write`: an unnamed O_TMPFILE linked into place.
+    Returns False, before consuming any chunk, if the filesystem lacks O_TMPFILE.
+    """
+    directory, name = os.path.split(path)
+    dir_fd = os.open(directory or ".", os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        try:
+            fd = os.open(".", os.O_TMPFILE | os.O_WRONLY, 0o644, dir_fd=dir_fd)
+        except OSError:
+            return False
+        try:
+            for chunk in chunks:
+                view = memoryview(chunk)
+                while view:
+                    view = view[os.write(fd, view) :]
+            # Naming the anonymous inode through /proc needs linkat with
+            # AT_SYMLINK_FOLLOW, which os.link only uses when given a dir_fd
+            proc_path = f"/proc/self/fd/{fd}"
+            try:
+                os.link(proc_path, name, dst_dir_fd=dir_fd)
+            except FileExistsError:
+                # linkat never replaces, so link under a unique name and rename
+                temp_name = f"{name}.{os.getpid()}.{threading.get_ident()}.tmp"
+                os.link(proc_path, temp_name, dst_dir_fd=dir_fd)
+                os.replace(temp_name, name, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+        finally:
+            os.close(fd)
+    finally:
+        os.close(dir_fd)
+    return True
+
+
+def _atomic_write(path: str, data: Union[bytes, Iterable[bytes]]) -> None:
+    """
+    Write `data`, or an iterable of byte chunks such as a streamed download, to
+    `path` so readers see either the old file or the new one.
+    """
+    chunks = (data,) if isinstance(data, bytes) else data
+    if _CAN_LINK_TMPFILE and _write_tmpfile_and_link(path, chunks):
+        return
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class _TokenBucket:
+    """Thread-safe token bucket; `acquire` blocks until a request may be sent."""
+
+    # Read and written on every request, so kept in slots rather than a __dict__
+    __slots__ = ("rate", "capacity", "_tokens", "_updated", "_paused_until", "_cond")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate  # Tokens added per second
+        self.capacity = capacity  # Largest burst allowed after an idle period
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+                self._cond.wait(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for `seconds`, e.g. after a Retry-After header."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0
+            self._cond.notify_all()  # Let sleepers recompute their wait
+
+
+def _rate_limit_wait(headers: Mapping[str, str]) -> Optional[float]:
+    """Seconds a server asked us to back off for, from Retry-After or X-RateLimit-*."""
+    retry_after = headers.get("Retry-After")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:  # HTTP-date form
+                return max(
+                    0.0, parsedate_to_datetime(retry_after).timestamp() - time.time()
+                )
+            except (TypeError, ValueError):
+                pass
+    if headers.get("X-RateLimit-Remaining") == "0":
+        try:
+            reset = float(headers.get("X-RateLimit-Reset", ""))
+        except ValueError:
+            return None
+        # Servers send either an epoch timestamp or a number of seconds
+        return max(0.0, reset - time.time()) if reset > 1e9 else reset
+    return None
+
+
+# --- SPARQL query templates (filled with str.format_map) ---
+
+_SEARCH_SELECT_VARS = "?dataset ?title (GROUP_CONCAT(DISTINCT ?kw; SEPARATOR='|') AS ?keywords) (SAMPLE(?pubName) AS ?publisher) (MAX(?mod) AS ?modified)"
+
+# Patterns every dataset search starts from; filters are appended after them
+_SEARCH_BASE_CLAUSES = (
+    "?dataset a dcat:Dataset .",
+    "OPTIONAL { ?dataset dct:title ?title . FILTER(LANGMATCHES(LANG(?title), 'en') || LANG(?title) = '') }",
+    "OPTIONAL { ?dataset dct:publisher ?pubURI . ?pubURI foaf:name ?pubName . }",
+    "OPTIONAL { ?dataset dct:modified ?mod . }",
+    "OPTIONAL { ?dataset dct:issued ?iss . }",
+)
+
+_SEARCH_QUERY_TEMPLATE = """
+PREFIX dcat: <http://www.w3.org/ns/dcat#>
+PREFIX dct: <http://purl.org/dc/terms/>
+PREFIX foaf: <http://xmlns.com/foaf/0.1/>
+PREFIX xsd: <http://www.w3.org/2001/XMLSchema#>
+
+SELECT {select_vars}
+WHERE {{
+{query_body}
+}}
+GROUP BY ?dataset ?title
+{order_clause}
+LIMIT {limit}
+OFFSET {offset}
+"""
+
+_DIST_CHUNK_QUERY_TEMPLATE = """
+PREFIX dcat: <http://www.w3.org/ns/dcat#>
+PREFIX dct: <http://purl.org/dc/terms/>
+
+SELECT ?dataset ?dist ?format ?downloadURL ?accessURL ?mediaType ?byteSize WHERE {{
+  VALUES ?dataset {{ {uri_values} }} # Filter for datasets in this chunk
+  ?dataset dcat:distribution ?dist .
+  OPTIONAL {{ ?dist dct:format ?formatURI . BIND(STR(?formatURI) AS ?format) }}
+  OPTIONAL {{ ?dist dcat:downloadURL ?downloadURL . }}
+  OPTIONAL {{ ?dist dcat:accessURL ?accessURL . }}
+  OPTIONAL {{ ?dist dcat:mediaType ?mediaType . }}
+  OPTIONAL {{ ?dist dcat:byteSize ?byteSize . }}
+}} LIMIT 1000
+"""
+
+_FALLBACK_DIST_QUERY_TEMPLATE = """
+PREFIX dcat: <http://www.w3.org/ns/dcat#>
+PREFIX dct: <http://purl.org/dc/terms/>
+SELECT DISTINCT ?dist ?downloadURL ?accessURL ?distTitle ?format_str ?mediaType ?byteSize
+WHERE {{
+  <{sparql_uri}> dcat:distribution ?dist .
+  OPTIONAL {{ ?dist dcat:downloadURL ?downloadURL . }}
+  OPTIONAL {{ ?dist dcat:accessURL ?accessURL . }}
+  OPTIONAL {{ ?dist dct:title ?distTitle . FILTER(LANGMATCHES(LANG(?distTitle), "en") || LANG(?distTitle) = "") }}
+  OPTIONAL {{ ?dist dct:format ?formatURI . BIND(COALESCE(STR(?formatURI), "") AS ?format_str) }} # Handle unbound format
+  OPTIONAL {{ ?dist dcat:mediaType ?mediaType . }}
+  OPTIONAL {{ ?dist dcat:byteSize ?byteSize . }}
+}} ORDER BY ?dist LIMIT 200
+"""
+
+# Variables of a fallback property pattern, e.g. "?value" or "?p"
+_PATTERN_VAR_RE = re.compile(r"\?(\w+)")
+
+# Separator for GROUP_CONCAT of multi-valued properties; it does not occur in
+# keywords or URIs, unlike the "|" used for search results
+_MULTI_VALUE_SEPARATOR = "\x1f"
+
+# Most values kept per multi-valued property, as the separate per-property
+# queries did with LIMIT 200; GROUP_CONCAT itself has no limit
+_MULTI_VALUE_LIMIT = 200
+
+# Properties of the SPARQL metadata fallback:
+# name -> (pattern, is_multi, required prefixes, aggregate), where the pattern
+# binds ?value, aggregate is the function that picks a single value (SAMPLE if
+# None) and is_multi indicates if multiple values are expected
+_FALLBACK_PROPERTY_QUERIES = {
+    "title": (
+        'dct:title ?value . FILTER(LANGMATCHES(LANG(?value), "en") || LANG(?value) = "")',
+        False,
+        "dct",
+        None,
+    ),
+    "description": (
+        'dct:description ?value . FILTER(LANGMATCHES(LANG(?value), "en") || LANG(?value) = "")',
+        False,
+        "dct",
+        None,
+    ),
+    "publisherName": (
+        'dct:publisher ?p . OPTIONAL { ?p foaf:name ?value . } OPTIONAL { ?p rdfs:label ?value . FILTER(LANGMATCHES(LANG(?value), "en") || LANG(?value) = "") } OPTIONAL { ?p skos:prefLabel ?value . FILTER(LANGMATCHES(LANG(?value), "en") || LANG(?value) = "") } FILTER(BOUND(?value))',
+        False,
+        "dct foaf rdfs skos",
+        None,
+    ),
+    "publisherUri": (
+        "dct:publisher ?value . FILTER(ISURI(?value))",
+        False,
+        "dct",
+        None,
+    ),  # Get publisher URI too
+    "modified": ("dct:modified ?value .", False, "dct", "MAX"),  # Latest date
+    "issued": ("dct:issued ?value .", False, "dct", "MAX"),  # Latest date
+    "keywords": ("dcat:keyword ?value .", True, "dcat", None),
+    "themes": (
+        "dcat:theme ?value . FILTER(ISURI(?value))",
+        True,
+        "dcat",
+        None,
+    ),  # Theme URIs
+    "languages": (
+        "dct:language ?value . FILTER(ISURI(?value))",
+        True,
+        "dct",
+        None,
+    ),  # Language URIs
+    "licenses": (
+        "dct:license ?value .",
+        True,
+        "dct",
+        None,
+    ),  # License URIs or Literals
+}
+_FALLBACK_PREFIXES = {
+    "dct": "PREFIX dct: <http://purl.org/dc/terms/>\n",
+    "foaf": "PREFIX foaf: <http://xmlns.com/foaf/0.1/>\n",
+    "skos": "PREFIX skos: <http://www.w3.org/2004/02/skos/core#>\n",
+    "rdfs": "PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>\n",
+    "dcat": "PREFIX dcat: <http://www.w3.org/ns/dcat#>\n",
+}
+
+
+def _build_fallback_templates() -> Dict[str, str]:
+    """Render the fallback property queries once, leaving only the URI to fill in.
+
+    All single-valued properties are fetched by one query of OPTIONAL blocks,
+    and all multi-valued ones by one query of UNION branches (so their values
+    don't multiply), with each property's values joined by
+    _MULTI_VALUE_SEPARATOR.
+    """
+    selects: Dict[bool, List[str]] = {False: [], True: []}
+    clauses: Dict[bool, List[str]] = {False: [], True: []}
+    prefixes: Dict[bool, set] = {False: set(), True: set()}
+    for prop_name, (
+        pattern,
+        is_multi,
+        req_prefixes,
+        aggregate,
+    ) in _FALLBACK_PROPERTY_QUERIES.items():
+        # Give every pattern its own variables, e.g. ?value -> ?title_value
+        # and ?p -> ?publisherName_p, so the patterns can share one query
+        renamed = _PATTERN_VAR_RE.sub(lambda m: f"?{prop_name}_{m.group(1)}", pattern)
+        # Braces in the pattern are escaped so format_map only fills in the URI
+        renamed = renamed.replace("{", "{{").replace("}", "}}")
+        value_var = f"?{prop_name}_value"
+        if is_multi:
+            selects[True].append(
+                f'(GROUP_CONCAT(DISTINCT STR({value_var}); separator="{_MULTI_VALUE_SEPARATOR}") AS ?{prop_name})'
+            )
+            clauses[True].append(f"{{{{ <{{sparql_uri}}> {renamed} }}}}")
+        else:
+            selects[False].append(
+                f"({aggregate or 'SAMPLE'}({value_var}) AS ?{prop_name})"
+            )
+            clauses[False].append(f"OPTIONAL {{{{ <{{sparql_uri}}> {renamed} }}}}")
+        prefixes[is_multi].update(req_prefixes.split())
+
+    templates = {}
+    for group, is_multi, joiner in (
+        ("scalars", False, "\n                  "),
+        ("multi", True, "\n                  UNION "),
+    ):
+        # Build necessary prefixes string
+        query_prefixes = "".join(
+            prefix
+            for p, prefix in _FALLBACK_PREFIXES.items()
+            if p in prefixes[is_multi]
+        )
+        # Aggregates without GROUP BY always yield exactly one row
+        templates[group] = f"""
+                {query_prefixes}
+                SELECT {" ".join(selects[is_multi])}
+                WHERE {{{{
+                  {joiner.join(clauses[is_multi])}
+                }}}}
+            """
+    return templates
+
+
+_FALLBACK_PROPERTY_TEMPLATES = _build_fallback_templates()
+
+
+# Extra markers that also count as a match for some preferred formats:
+# (substrings of the upper-cased format, substrings of the upper-cased media type)
+_FORMAT_ALIASES = {
+    "RDF": (("XML", "TURTLE", "N3", "JSON-LD"), ()),
+    "XML": ((), ("XML",)),
+    "JSON": ((), ("JSON",)),
+    "CSV": ((), ("CSV",)),
+}
+# get_dataset_content also takes OWL as RDF and "comma-separated" labels as CSV
+_CONTENT_FORMAT_ALIASES = {
+    **_FORMAT_ALIASES,
+    "RDF": (_FORMAT_ALIASES["RDF"][0] + ("OWL",), ()),
+    "CSV": (("COMMA-SEPARATED",), ("CSV",)),
+}
+
+
+def _build_alias_scanner(
+    aliases: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]],
+) -> Callable[[str, str], FrozenSet[str]]:
+    """
+    Compile an alias table into a function that returns the preferred formats
+    whose markers occur in an upper-cased format and media type, so each
+    distribution is scanned once rather than once per marker and preference.
+    """
+    scanners: List[Optional[Tuple["re.Pattern[str]", Dict[str, FrozenSet[str]]]]] = []
+    for side in (0, 1):  # Format markers, then media type markers
+        prefs_by_marker: Dict[str, set] = defaultdict(set)
+        for pref, markers in aliases.items():
+            for marker in markers[side]:
+                prefs_by_marker[marker].add(pref)
+        if not prefs_by_marker:
+            scanners.append(None)
+            continue
+        # The lookahead finds a marker at every position, overlapping ones
+        # included; the longest marker wins at a position, so it also stands
+        # for the markers that are its prefixes
+        ordered = sorted(prefs_by_marker, key=len, reverse=True)
+        pattern = re.compile(
+            "(?=(" + "|".join(re.escape(marker) for marker in ordered) + "))"
+        )
+        prefs_at = {
+            marker: frozenset().union(
+                *(
+                    prefs
+                    for other, prefs in prefs_by_marker.items()
+                    if marker.startswith(other)
+                )
+            )
+            for marker in ordered
+        }
+        scanners.append((pattern, prefs_at))
+
+    def alias_formats(format_value: str, media_type: str) -> FrozenSet[str]:
+        found: set = set()
+        for scanner, text in zip(scanners, (format_value, media_type)):
+            if scanner and text:
+                pattern, prefs_at = scanner
+                for match in pattern.finditer(text):
+                    found |= prefs_at[match.group(1)]
+        return frozenset(found)
+
+    return alias_formats
+
+
+_format_alias_formats = _build_alias_scanner(_FORMAT_ALIASES)
+_content_alias_formats = _build_alias_scanner(_CONTENT_FORMAT_ALIASES)
+
+# Markers of textual Content-Types; a download whose (lower-cased) type
+# contains none of them is treated as binary
+_TEXT_CONTENT_TYPE_TOKENS = (
+    "text",
+    "json",
+    "xml",
+    "csv",
+    "html",
+    "rdf",
+    "turtle",
+    "n3",
+    "sparql-results",
+    "ld+json",
+)
+_TEXT_CONTENT_TYPE_RE = re.compile("|".join(map(re.escape, _TEXT_CONTENT_TYPE_TOKENS)))
+
+# Content-Types that say nothing about the payload; the body itself decides
+_GENERIC_CONTENT_TYPES = frozenset(
+    ("", "application/octet-stream", "binary/octet-stream")
+)
+
+
+def _is_utf8_prefix(sample: bytes) -> bool:
+    """Whether `sample`, the start of a body, is UTF-8 (possibly cut mid-character)."""
+    try:
+        sample.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # Only a multi-byte character cut off by the end of the sample is fine
+        return e.reason == "unexpected end of data"
+    return True
+
+
+# Separators within format labels and URIs, e.g. ".../file-type/CSV" or "JSON-LD"
+_FORMAT_TOKEN_RE = re.compile(r"[/;,+\s\-._?=&#]+")
+
+
+def _known_formats(
+    format_value: str, url_tail: str, alias_formats: FrozenSet[str]
+) -> FrozenSet[str]:
+    """
+    Formats a distribution certainly matches: the tokens of its upper-cased
+    format, the extension of its URL's file name and its alias matches. A
+    preferred format found here needs no substring checks.
+    """
+    tokens = set(_FORMAT_TOKEN_RE.split(format_value)) if format_value else set()
+    ext = os.path.splitext(url_tail)[1]
+    if ext:
+        tokens.add(ext[1:].upper())
+    tokens.discard("")
+    return alias_formats.union(tokens)
+
+
+def _matches_preferred_format(
+    fmt_pref: str, format_value: str, url_tail: str, known_formats: FrozenSet[str]
+) -> bool:
+    """
+    Check a distribution against an upper-cased preferred format, given its
+    upper-cased format, the lower-cased file name of its URL and its
+    _known_formats.
+    """
+    if fmt_pref in known_formats:
+        return True
+    if format_value and fmt_pref in format_value:
+        return True
+    ext = fmt_pref.lower()
+    return f".{ext}" in url_tail or f"format={ext}" in url_tail
+
+
+def _binding_value(binding: Dict[str, Any], key: str) -> Optional[str]:
+    """Return the "value" of a SPARQL JSON result binding, or None if unbound."""
+    return (binding.get(key) or {}).get("value")
+
+
+# Filename sanitizing: URI separators become "_" in one translate pass,
+# then anything but word characters, "." and "-" is dropped
+_SANITIZE_TRANS = str.maketrans({c: "_" for c in "/:?&="})
+_SANITIZE_RE = re.compile(r"[^\w.\-]")
+
+
+# Module level rather than on the method, so the cache holds no tool instances;
+# the same dataset URIs are sanitized again for every cache key built from them
+@functools.lru_cache(maxsize=4096)
+def _sanitize(uri_or_key: str) -> str:
+    """Turn a URI or cache key into a safe filename component."""
+    # Schemes are stripped wherever they occur, e.g. inside "metadata_http://..."
+    sanitized = (
+        uri_or_key.replace("http://", "")
+        .replace("https://", "")
+        .translate(_SANITIZE_TRANS)
+    )
+    sanitized = _SANITIZE_RE.sub("", sanitized)
+    # Limit length to avoid issues with long filenames
+    return sanitized[:150]
+
+
+# Dataset UUID patterns, compiled once at import since they run on every
+# metadata request
+_UUID_PATTERN = (
+    r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+)
+# /data/datasets/{UUID}, /88u/dataset/{UUID} or /set/data/{UUID}
+_DATASET_UUID_RE = re.compile(rf"/(?:datasets|dataset|set/data)/({_UUID_PATTERN})")
+# /set/{UUID} or /set/{UUID}/resource/...
+_SET_UUID_RE = re.compile(rf"/set/({_UUID_PATTERN})(/|$)")
+
+
+@functools.lru_cache(maxsize=4096)
+def _extract_uuid(dataset_uri: str) -> Optional[str]:
+    """Return the dataset UUID in a data.europa.eu URI, or None if it has none."""
+    match = _DATASET_UUID_RE.search(dataset_uri) or _SET_UUID_RE.search(dataset_uri)
+    return match.group(1) if match else None
+
+
 class EUDataTool:
     """
     An enhanced helper class to query High-Value Datasets from data.europa.eu.
@@ -24,6 +619,18 @@ class EUDataTool:
     DEFAULT_CACHE_TTL = 86400
     REQUEST_TIMEOUT = 120
     REQUEST_DELAY = 0.5  # Seconds between requests to avoid rate limiting
+    REQUEST_BURST = 4  # Requests allowed back to back after an idle period
+    MAX_CONCURRENT_QUERIES = 4  # Parallel SPARQL requests for distribution chunks
+    MAX_METADATA_WORKERS = 8  # Parallel lookups in get_dataset_metadata_many
+    MAX_CONTENT_WORKERS = 8  # Parallel downloads in get_dataset_content_many
+    MAX_CLEAR_WORKERS = 16  # Parallel unlinks when clearing the whole cache
+    MEMORY_CACHE_SIZE = 256  # Parsed metadata results kept in memory
+    MEMORY_CACHE_TTL = 300  # Seconds, capped at cache_ttl
+    CACHE_DB_NAME = "cache.sqlite"
+    CACHE_INDEX_NAME = (
+        "cache_index.tsv"  # Per-dataset entry index of the "json" backend
+    )
+    _CACHE_VALIDATORS = ("etag", "last_modified")  # Stored per entry for revalidation
 
     def __init__(
         self,
@@ -32,7 +639,20 @@ class EUDataTool:
         cache_dir: str = ".eu_data_cache",
         cache_ttl: int = DEFAULT_CACHE_TTL,
         preferred_formats: Optional[List[str]] = None,
+        cache_backend: str = "sqlite",
+        transport: str = "requests",
+        prewarm: bool = False,
     ):
+        # "sqlite" keeps SPARQL/metadata entries in one database; "json" keeps
+        # the older one-file-per-entry layout. Downloaded content is always
+        # stored as files.
+        if cache_backend not in ("sqlite", "json"):
+            raise ValueError(f"Unsupported cache backend: {cache_backend!r}")
+        # "httpx" fetches REST metadata and downloads over HTTP/2, so the
+        # concurrent requests of get_dataset_metadata_many and
+        # get_dataset_content_many share one multiplexed connection per host
+        if transport not in ("requests", "httpx"):
+            raise ValueError(f"Unsupported transport: {transport!r}")
         # Headers for general REST API calls (preferring JSON-LD)
         self.headers = {
             "Accept": "application/ld+json, application/json, */*",
@@ -47,36 +667,483 @@ class EUDataTool:
         self.cache_enabled = cache_enabled
         self.cache_dir = cache_dir
         self.cache_ttl = cache_ttl
+        self.cache_backend = cache_backend
+        self.transport = transport
         self.preferred_formats = preferred_formats or ["CSV", "JSON", "XML", "RDF"]
-        self._last_request_time = 0
+        # One token bucket per service, so SPARQL, REST and download traffic
+        # are throttled independently
+        self._buckets: Dict[str, _TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+        self._session = self._build_session()
+        self._hclient: Optional[httpx.Client] = None
+        if self.transport == "httpx":
+            # An explicit transport owns the connection pool; httpx ignores
+            # the client's own http2 and limits arguments once one is given
+            self._hclient = httpx.Client(
+                timeout=self.REQUEST_TIMEOUT,
+                follow_redirects=True,
+                transport=httpx.HTTPTransport(
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=32, max_keepalive_connections=16
+                    ),
+                    retries=3,
+                ),
+            )
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._index_lock = threading.Lock()
+        # Rows of the "json" backend's index file as last read, with the file's
+        # (mtime, size) then, so appends skip rows it already holds
+        self._index_rows: Optional[Set[Tuple[str, str]]] = None
+        self._index_stamp: Optional[Tuple[int, int]] = None
+        # Recent get_dataset_metadata results by (uri, locale), in front of the
+        # cache store so repeated lookups skip the read, decompress and decode
+        self._memo: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+        self._memo_lock = threading.Lock()
         if self.cache_enabled:
             os.makedirs(self.cache_dir, exist_ok=True)
+            if self.cache_backend == "sqlite":
+                self._db = self._open_cache_db()
             logging.info(
                 f"EUDataTool cache enabled at: {os.path.abspath(self.cache_dir)}"
             )
+        if prewarm:
+            # Open the pooled connections in the background, so the first real
+            # call doesn't pay for DNS, TCP and TLS
+            threading.Thread(
+                target=self._prewarm, name="EUDataTool-prewarm", daemon=True
+            ).start()
+
+    def _prewarm(self) -> None:
+        """Send a HEAD request to the REST and SPARQL hosts; failures are ignored."""
+        for url in (self.REST_API_BASE, self.SPARQL_ENDPOINT):
+            try:
+                if self._hclient is not None and url == self.REST_API_BASE:
+                    # REST calls go over HTTP/2
+                    self._hclient.head(url, headers=self.headers, timeout=2)
+                else:
+                    self._session.head(url, headers=self.headers, timeout=2)
+            except Exception as e:  # Only a warm-up, the real call will report it
+                logging.debug(f"Prewarming {url} failed: {e}")
+
+    def _build_session(self) -> requests.Session:
+        """Create a pooled session so SPARQL and REST calls reuse their TLS connections."""
+        session = requests.Session()
+        retries = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            # SPARQL queries are POSTed but read-only, so they are safe to retry
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"},
+            # Hand the last error response back so its body can still be reported
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retries)
+        # Endpoints overridden with plain-http URLs get the same pooling and retries
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def close(self):
+        """Release the pooled HTTP connections and the cache database."""
+        self._session.close()
+        if self._hclient is not None:
+            self._hclient.close()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+            self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _bucket_for(self, service: str) -> _TokenBucket:
+        """Return the token bucket for a service, creating it on first use."""
+        with self._buckets_lock:
+            bucket = self._buckets.get(service)
+            if bucket is None:
+                bucket = self._buckets[service] = _TokenBucket(
+                    rate=1 / self.REQUEST_DELAY, capacity=self.REQUEST_BURST
+                )
+            return bucket
 
-    def _ensure_request_delay(self):
-        """Ensures a minimum delay between consecutive requests."""
-        now = time.time()
-        elapsed = now - self._last_request_time
-        if elapsed < self.REQUEST_DELAY:
-            time.sleep(self.REQUEST_DELAY - elapsed)
-        self._last_request_time = time.time()
+    def _ensure_request_delay(self, service: str) -> None:
+        """Wait until the rate limit for a service allows another request."""
+        self._bucket_for(service).acquire()
+
+    def _note_rate_limit(
+        self, service: str, response: Union[requests.Response, httpx.Response]
+    ) -> None:
+        """Pause a service's bucket when the response asks us to back off."""
+        wait = _rate_limit_wait(response.headers)
+        if wait:
+            logging.warning(f"Rate limited by {service}; pausing for {wait:.1f}s")
+            self._bucket_for(service).pause(wait)
 
     def _sanitize_filename(self, uri_or_key: str) -> str:
         """Sanitize a string (URI or key) to create a safe filename component."""
-        sanitized = (
-            uri_or_key.replace("http://", "")
-            .replace("https://", "")
-            .replace("/", "_")
-            .replace(":", "_")
-            .replace("?", "_")
-            .replace("&", "_")
-            .replace("=", "_")
+        return _sanitize(uri_or_key)
+
+    # --- Cache storage (SQLite database or one JSON file per key) ---
+
+    def _open_cache_db(self) -> sqlite3.Connection:
+        """Open, creating if needed, the SQLite database backing the cache."""
+        db = sqlite3.connect(
+            os.path.join(self.cache_dir, self.CACHE_DB_NAME),
+            check_same_thread=False,  # Access is serialized by self._db_lock
+            isolation_level=None,  # Autocommit: each write is its own transaction
         )
-        sanitized = "".join(c for c in sanitized if c.isalnum() or c in ("_", "-", "."))
-        # Limit length to avoid issues with long filenames
-        return sanitized[:150]
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key TEXT PRIMARY KEY, ts REAL NOT NULL, payload BLOB NOT NULL, "
+            "etag TEXT, last_modified TEXT)"
+        )
+        # Which entries and content files belong to which dataset, for clear_cache
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS cache_index "
+            "(scope TEXT NOT NULL, name TEXT NOT NULL, PRIMARY KEY (scope, name)) "
+            "WITHOUT ROWID"
+        )
+        # Deleting one entry removes its index rows by name
+        db.execute("CREATE INDEX IF NOT EXISTS cache_index_name ON cache_index (name)")
+        # Databases created before the validator columns existed
+        columns = {row[1] for row in db.execute("PRAGMA table_info(cache)")}
+        for column in self._CACHE_VALIDATORS:
+            if column not in columns:
+                db.execute(f"ALTER TABLE cache ADD COLUMN {column} TEXT")
+        return db
+
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for a key, or None if missing, expired or unreadable."""
+        if self._db is not None:
+            return self._cache_get_many([key]).get(key)
+
+        cache_path = os.path.join(self.cache_dir, key + ".json")
+        if not os.path.exists(cache_path):
+            return None
+        try:
+            with open(cache_path, "rb") as f:
+                cached_data = _json_loads(f.read())
+        except (ValueError, IOError) as e:
+            logging.warning(
+                f"Cache read error for {cache_path}: {e}. Fetching fresh data."
+            )
+            self._cache_delete(key)  # Remove corrupted cache file
+            return None
+        if time.time() - cached_data.get("_cache_timestamp", 0) >= self.cache_ttl:
+            logging.debug(f"Cache expired for: {key}")
+            return None
+        # Return without internal cache fields
+        return {k: v for k, v in cached_data.items() if not k.startswith("_")}
+
+    def _cache_get_many(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Return the usable cached entries among `keys`, keyed by cache key."""
+        if not keys:
+            return {}
+        if self._db is None:
+            entries = {}
+            for key in keys:
+                cached_data = self._cache_get(key)
+                if cached_data is not None:
+                    entries[key] = cached_data
+            return entries
+
+        # One query for the whole batch instead of a round trip per key
+        placeholders = ", ".join("?" * len(keys))
+        try:
+            with self._db_lock:
+                rows = self._db.execute(
+                    f"SELECT key, ts, payload FROM cache WHERE key IN ({placeholders})",
+                    keys,
+                ).fetchall()
+        except sqlite3.Error as e:
+            logging.warning(f"Cache read error: {e}. Fetching fresh data.")
+            return {}
+
+        entries = {}
+        now = time.time()
+        for key, cache_time, payload in rows:
+            # The timestamp is a column, so expired entries are never decoded
+            if now - cache_time >= self.cache_ttl:
+                logging.debug(f"Cache expired for: {key}")
+                continue
+            try:
+                entries[key] = _json_loads(_decompress_payload(payload))
+            except _CORRUPT_PAYLOAD_ERRORS as e:
+                logging.warning(
+                    f"Cache entry {key} is corrupt: {e}. Fetching fresh data."
+                )
+                self._cache_delete(key)
+        return entries
+
+    def _cache_put(
+        self,
+        key: str,
+        data: Dict[str, Any],
+        validators: Optional[Dict[str, str]] = None,
+        scope: Optional[str] = None,
+    ) -> bool:
+        """
+        Store an entry under a key, returning False if it could not be written.
+
+        `validators` holds the response's "etag" and/or "last_modified" so the
+        entry can be revalidated with a conditional request once it expires.
+        `scope`, a sanitized dataset URI, indexes the entry for clear_cache.
+        """
+        validators = validators or {}
+        if self._db is not None:
+            payload = _compress_payload(_json_dumps(data))
+            try:
+                with self._db_lock:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO cache "
+                        "(key, ts, payload, etag, last_modified) VALUES (?, ?, ?, ?, ?)",
+                        (
+                            key,
+                            time.time(),
+                            payload,
+                            validators.get("etag"),
+                            validators.get("last_modified"),
+                        ),
+                    )
+            except sqlite3.Error as e:
+                logging.error(f"Failed to write cache entry {key}: {e}")
+                return False
+            if scope:
+                self._index_add(scope, (key,))
+            return True
+
+        cache_path = os.path.join(self.cache_dir, key + ".json")
+        data_to_cache = data.copy()  # Avoid modifying the caller's dict
+        data_to_cache["_cache_timestamp"] = time.time()
+        for name, value in validators.items():
+            data_to_cache[f"_cache_{name}"] = value
+        try:
+            _atomic_write(cache_path, _json_dumps(data_to_cache))
+        except IOError as e:
+            logging.error(f"Failed to write cache file {cache_path}: {e}")
+            return False
+        if scope:
+            self._index_add(scope, (key,))
+        return True
+
+    def _cache_validators(self, key: str) -> Dict[str, str]:
+        """Return the stored "etag"/"last_modified" of an entry, even an expired one."""
+        if self._db is not None:
+            try:
+                with self._db_lock:
+                    row = self._db.execute(
+                        "SELECT etag, last_modified FROM cache WHERE key = ?", (key,)
+                    ).fetchone()
+            except sqlite3.Error:
+                return {}
+            if row is None:
+                return {}
+            return {
+                name: value for name, value in zip(self._CACHE_VALIDATORS, row) if value
+            }
+
+        cache_path = os.path.join(self.cache_dir, key + ".json")
+        try:
+            with open(cache_path, "rb") as f:
+                cached_data = _json_loads(f.read())
+        except (ValueError, IOError):
+            return {}
+        return {
+            name: cached_data[f"_cache_{name}"]
+            for name in self._CACHE_VALIDATORS
+            if cached_data.get(f"_cache_{name}")
+        }
+
+    def _cache_refresh(self, key: str) -> Optional[Dict[str, Any]]:
+        """Restart the TTL of an entry the server reported unchanged and return it."""
+        if self._db is not None:
+            try:
+                with self._db_lock:
+                    self._db.execute(
+                        "UPDATE cache SET ts = ? WHERE key = ?", (time.time(), key)
+                    )
+            except sqlite3.Error as e:
+                logging.warning(f"Could not refresh cache entry {key}: {e}")
+                return None
+            return self._cache_get(key)
+
+        cache_path = os.path.join(self.cache_dir, key + ".json")
+        try:
+            with open(cache_path, "rb") as f:
+                cached_data = _json_loads(f.read())
+        except (ValueError, IOError):
+            return None
+        data = {k: v for k, v in cached_data.items() if not k.startswith("_")}
+        validators = {
+            name: cached_data[f"_cache_{name}"]
+            for name in self._CACHE_VALIDATORS
+            if cached_data.get(f"_cache_{name}")
+        }
+        self._cache_put(key, data, validators)
+        return data
+
+    def _cache_delete(self, key: str) -> bool:
+        """Remove the entry for a key, returning True if one was removed."""
+        if self._db is not None:
+            try:
+                with self._db_lock:
+                    cursor = self._db.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    self._db.execute("DELETE FROM cache_index WHERE name = ?", (key,))
+            except sqlite3.Error as e:
+                logging.warning(f"Could not remove cache entry {key}: {e}")
+                return False
+            return cursor.rowcount > 0
+
+        cache_path = os.path.join(self.cache_dir, key + ".json")
+        try:
+            os.remove(cache_path)
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logging.warning(f"Could not remove cache file {cache_path}: {e}")
+            return False
+        return True
+
+    def _index_add(self, scope: str, names: Iterable[str]) -> None:
+        """Record cache entry keys or content file names as belonging to a dataset."""
+        rows = [(scope, name) for name in names]
+        if self._db is not None:
+            try:
+                with self._db_lock:
+                    self._db.executemany(
+                        "INSERT OR IGNORE INTO cache_index (scope, name) VALUES (?, ?)",
+                        rows,
+                    )
+            except sqlite3.Error as e:
+                logging.warning(f"Could not index cache entries of {scope}: {e}")
+            return
+
+        # Sanitized names hold no tabs or newlines, so one row per line is safe
+        index_path = os.path.join(self.cache_dir, self.CACHE_INDEX_NAME)
+        try:
+            with self._index_lock:
+                known = self._index_file_rows(index_path)
+                # Refetched datasets write the same rows again; append only new ones
+                new_rows = [row for row in dict.fromkeys(rows) if row not in known]
+                if not new_rows:
+                    return
+                with open(index_path, "a", encoding="utf-8") as f:
+                    f.writelines(f"{scope}\t{name}\n" for scope, name in new_rows)
+                known.update(new_rows)
+                stat = os.stat(index_path)
+                self._index_stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError as e:
+            logging.warning(f"Could not index cache entries of {scope}: {e}")
+
+    def _index_file_rows(self, index_path: str) -> Set[Tuple[str, str]]:
+        """
+        Return the rows of the "json" backend's index file, reading it again only
+        if it changed on disk since the last read. Call with _index_lock held.
+        """
+        try:
+            stat = os.stat(index_path)
+        except FileNotFoundError:
+            self._index_rows, self._index_stamp = set(), None
+            return self._index_rows
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if self._index_rows is None or stamp != self._index_stamp:
+            rows = set()
+            with open(index_path, encoding="utf-8") as f:
+                for line in f:
+                    scope, _, name = line.rstrip("\n").partition("\t")
+                    rows.add((scope, name))
+            self._index_rows, self._index_stamp = rows, stamp
+        return self._index_rows
+
+    def _index_pop(self, scopes: List[str]) -> Set[str]:
+        """Forget and return the names recorded for any of the given datasets."""
+        if self._db is not None:
+            placeholders = ", ".join("?" * len(scopes))
+            try:
+                with self._db_lock:
+                    names = {
+                        row[0]
+                        for row in self._db.execute(
+                            f"SELECT name FROM cache_index WHERE scope IN ({placeholders})",
+                            scopes,
+                        )
+                    }
+                    self._db.execute(
+                        f"DELETE FROM cache_index WHERE scope IN ({placeholders})",
+                        scopes,
+                    )
+            except sqlite3.Error as e:
+                logging.warning(f"Could not read the cache index: {e}")
+                return set()
+            return names
+
+        index_path = os.path.join(self.cache_dir, self.CACHE_INDEX_NAME)
+        names = set()
+        kept: Dict[str, None] = {}  # Ordered and duplicate-free
+        with self._index_lock:
+            try:
+                with open(index_path, encoding="utf-8") as f:
+                    for line in f:
+                        scope, _, name = line.rstrip("\n").partition("\t")
+                        if scope in scopes:
+                            names.add(name)
+                        else:
+                            kept[line] = None
+                if names:
+                    # Rewriting the file also compacts any duplicate rows
+                    _atomic_write(index_path, "".join(kept).encode("utf-8"))
+                    self._index_rows = None
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logging.warning(f"Could not read the cache index {index_path}: {e}")
+        return names
+
+    def _memo_get(self, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        """Return a recent in-memory metadata result, or None."""
+        with self._memo_lock:
+            entry = self._memo.get(key)
+            if entry is None:
+                return None
+            stored_at, data = entry
+            if time.monotonic() - stored_at >= min(
+                self.cache_ttl, self.MEMORY_CACHE_TTL
+            ):
+                del self._memo[key]
+                return None
+            self._memo.move_to_end(key)
+        # Callers get their own copy, so mutating a result cannot change
+        # what later lookups return
+        return copy.deepcopy(data)
+
+    def _memo_put(self, key: Tuple[str, str], data: Dict[str, Any]) -> None:
+        """Remember a metadata result, evicting the least recently used ones."""
+        if self.MEMORY_CACHE_SIZE <= 0:
+            return
+        data = copy.deepcopy(data)  # Detached from the dict handed to the caller
+        with self._memo_lock:
+            self._memo[key] = (time.monotonic(), data)
+            self._memo.move_to_end(key)
+            while len(self._memo) > self.MEMORY_CACHE_SIZE:
+                self._memo.popitem(last=False)
+
+    @staticmethod
+    def _sparql_cache_key(query: str, cache_key_suffix: str = "query") -> str:
+        """Cache key for a SPARQL query: a hash of its text plus a readable suffix."""
+        # A 16-byte BLAKE2b digest is cheaper than MD5 and keeps the same
+        # 32-character hex key length
+        query_hash = hashlib.blake2b(query.encode("utf-8"), digest_size=16).hexdigest()
+        # Add prefix to distinguish SPARQL cache entries
+        return f"sparql_{query_hash}_{cache_key_suffix}"
 
     def _execute_sparql_query(
         self, query: str, force_refresh: bool = False, cache_key_suffix: str = "query"
@@ -85,92 +1152,107 @@ class EUDataTool:
         Executes a SPARQL query, handling caching and potential errors.
         Used for search and as a fallback for metadata.
         """
-        # Generate cache key based on query hash
-        query_hash = hashlib.md5(query.encode("utf-8")).hexdigest()
-        # Add prefix to distinguish SPARQL cache files
-        cache_path = os.path.join(
-            self.cache_dir, f"sparql_{query_hash}_{cache_key_suffix}.json"
-        )
+        return self._execute_sparql_queries([(query, cache_key_suffix)], force_refresh)[
+            0
+        ]
 
-        # Check cache first
-        if self.cache_enabled and not force_refresh and os.path.exists(cache_path):
-            try:
-                with open(cache_path, "r", encoding="utf-8") as f:
-                    cached_data = json.load(f)
-                cache_time = cached_data.get("_cache_timestamp", 0)
-                if time.time() - cache_time < self.cache_ttl:
-                    logging.debug(
-                        f"SPARQL Cache hit for query hash: {query_hash} ({cache_key_suffix})"
-                    )
-                    # Return without internal cache fields
-                    return {
-                        k: v for k, v in cached_data.items() if not k.startswith("_")
-                    }
-                else:
-                    logging.debug(
-                        f"SPARQL Cache expired for query hash: {query_hash} ({cache_key_suffix})"
-                    )
-            except (json.JSONDecodeError, IOError, UnicodeDecodeError) as e:
-                logging.warning(
-                    f"SPARQL Cache read error for {cache_path}: {e}. Fetching fresh data."
-                )
-                try:
-                    os.remove(cache_path)  # Remove corrupted cache file
-                except OSError:
-                    pass  # Ignore if file cannot be removed
+    def _execute_sparql_queries(
+        self,
+        jobs: List[Tuple[str, str]],
+        force_refresh: bool = False,
+        scope: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute a batch of (query, cache_key_suffix) jobs, returning their results
+        in order. Cached entries are looked up in one pass and the remaining
+        queries are sent concurrently. `scope` is passed on to _cache_put.
+        """
+        cache_keys = [self._sparql_cache_key(query, suffix) for query, suffix in jobs]
+        cached = {}
+        if self.cache_enabled and not force_refresh:
+            cached = self._cache_get_many(list(dict.fromkeys(cache_keys)))
+            for cache_key in cached:
+                logging.debug(f"SPARQL Cache hit for: {cache_key}")
+
+        # Repeated jobs share one request
+        misses = {
+            cache_key: (query, suffix, cache_key)
+            for (query, suffix), cache_key in zip(jobs, cache_keys)
+            if cache_key not in cached
+        }
+
+        def fetch(job: Tuple[str, str, str]) -> Dict[str, Any]:
+            query, suffix, cache_key = job
+            results = self._fetch_sparql(query, suffix)
+            # Errors are returned to the caller but never cached
+            if "error" not in results and self.cache_enabled:
+                if self._cache_put(cache_key, results, scope=scope):
+                    logging.debug(f"SPARQL Cached results for: {cache_key}")
+            return results
 
-        # --- Fetch fresh data ---
-        self._ensure_request_delay()
+        if len(misses) > 1:
+            workers = min(len(misses), self.MAX_CONCURRENT_QUERIES)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                fetched = list(executor.map(fetch, misses.values()))
+        else:
+            fetched = [fetch(job) for job in misses.values()]
+
+        cached.update(zip(misses, fetched))
+        return [cached[cache_key] for cache_key in cache_keys]
+
+    def _fetch_sparql(self, query: str, cache_key_suffix: str) -> Dict[str, Any]:
+        """Send one SPARQL query to the endpoint, without consulting the cache."""
+        self._ensure_request_delay(self.SPARQL_ENDPOINT)
         logging.debug(f"Executing SPARQL query ({cache_key_suffix}):\n{query}")
+        # Distribution listings run to hundreds of bindings; decode those
+        # incrementally so the raw body is never held next to the parsed tree
+        stream = ijson is not None and cache_key_suffix.startswith("dists_")
         try:
-            response = requests.get(
+            # POST the query form-encoded (SPARQL 1.1 Protocol) so large
+            # queries are not packed into the URL
+            response = self._session.post(
                 self.SPARQL_ENDPOINT,
-                params={"query": query},
+                data={"query": query},
                 headers=self.sparql_headers,  # Use SPARQL specific headers
                 timeout=self.REQUEST_TIMEOUT,
+                stream=stream,
             )
-            response.raise_for_status()  # Raises HTTPError for bad responses (4xx or 5xx)
-            results = response.json()
-
-            # Cache the results
-            if self.cache_enabled:
-                results_to_cache = (
-                    results.copy()
-                )  # Avoid modifying original results dict
-                results_to_cache["_cache_timestamp"] = time.time()
-                try:
-                    temp_file = cache_path + ".tmp"
-                    with open(temp_file, "w", encoding="utf-8") as f:
-                        json.dump(results_to_cache, f, ensure_ascii=False)
-                    os.replace(temp_file, cache_path)
-                    logging.debug(
-                        f"SPARQL Cached results for query hash: {query_hash} ({cache_key_suffix})"
-                    )
-                except IOError as e:
-                    logging.error(
-                        f"Failed to write SPARQL cache file {cache_path}: {e}"
+            with response:
+                self._note_rate_limit(self.SPARQL_ENDPOINT, response)
+                if not response.ok:
+                    response.content  # Buffer the error body before the stream closes
+                response.raise_for_status()  # Raises HTTPError for bad responses (4xx or 5xx)
+                if stream:
+                    # Decode gzip on the fly and build one binding at a time
+                    response.raw.decode_content = True
+                    bindings = ijson.items(
+                        response.raw, "results.bindings.item", use_float=True
                     )
+                    results = {"results": {"bindings": list(bindings)}}
+                else:
+                    results = _json_loads(response.content)
 
-            # Return full results (internal methods might need the structure)
-            # Callers that need cleaned data should strip "_cache_timestamp"
             return results
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, Urllib3HTTPError) as e:
             error_msg = f"SPARQL query failed ({cache_key_suffix}): {str(e)}"
-            if e.response is not None:
-                error_msg += f" - Status Code: {e.response.status_code}"
+            # urllib3 errors carry no response, and requests' may have none
+            error_response = getattr(e, "response", None)
+            if error_response is not None:
+                error_msg += f" - Status Code: {error_response.status_code}"
                 try:
-                    # Try to get more detailed error from response body if available
-                    error_detail = e.response.text
-                    error_msg += (
-                        f" - Response: {error_detail[:500]}"  # Limit response length
+                    # Try to get more detailed error from response body if available;
+                    # only the prefix that is kept gets decoded
+                    error_detail = error_response.content[:512].decode(
+                        "utf-8", "replace"
                     )
+                    error_msg += f" - Response: {error_detail}"
                 except Exception:
                     pass  # Ignore if response body cannot be read
             logging.error(error_msg)
             # Return consistent error structure with empty bindings
             return {"error": error_msg, "results": {"bindings": []}}
-        except json.JSONDecodeError as e:
+        except _DECODE_ERRORS as e:
             error_msg = (
                 f"Failed to decode SPARQL JSON response ({cache_key_suffix}): {e}"
             )
@@ -201,16 +1283,7 @@ class EUDataTool:
             preferred_formats = self.preferred_formats  # Use instance default
 
         # --- 1. Construct the initial SPARQL query for datasets ---
-        select_vars = "?dataset ?title (GROUP_CONCAT(DISTINCT ?kw; SEPARATOR='|') AS ?keywords) (SAMPLE(?pubName) AS ?publisher) (MAX(?mod) AS ?modified)"
-        where_clauses = ["?dataset a dcat:Dataset ."]
-        where_clauses.append(
-            "OPTIONAL { ?dataset dct:title ?title . FILTER(LANGMATCHES(LANG(?title), 'en') || LANG(?title) = '') }"
-        )
-        where_clauses.append(
-            "OPTIONAL { ?dataset dct:publisher ?pubURI . ?pubURI foaf:name ?pubName . }"
-        )
-        where_clauses.append("OPTIONAL { ?dataset dct:modified ?mod . }")
-        where_clauses.append("OPTIONAL { ?dataset dct:issued ?iss . }")
+        where_clauses = list(_SEARCH_BASE_CLAUSES)
 
         # --- Keyword Filtering Logic ---
         if keyword:
@@ -287,23 +1360,15 @@ class EUDataTool:
             order_clause = f"ORDER BY {sort_dir}(SAMPLE(?title))"  # Need SAMPLE or similar inside GROUP BY context
         # Relevance sorting is not directly supported
 
-        query_body = "\n".join(where_clauses)
-
-        initial_query = f"""
-        PREFIX dcat: <http://www.w3.org/ns/dcat#>
-        PREFIX dct: <http://purl.org/dc/terms/>
-        PREFIX foaf: <http://xmlns.com/foaf/0.1/>
-        PREFIX xsd: <http://www.w3.org/2001/XMLSchema#>
-
-        SELECT {select_vars}
-        WHERE {{
-            {query_body}
-        }}
-        GROUP BY ?dataset ?title
-        {order_clause}
-        LIMIT {limit}
-        OFFSET {offset}
-        """
+        initial_query = _SEARCH_QUERY_TEMPLATE.format_map(
+            {
+                "select_vars": _SEARCH_SELECT_VARS,
+                "query_body": "\n".join(where_clauses),
+                "order_clause": order_clause,
+                "limit": limit,
+                "offset": offset,
+            }
+        )
 
         # --- 2. Execute the initial search query ---
         search_response = self._execute_sparql_query(
@@ -323,60 +1388,53 @@ class EUDataTool:
             return {"total_results": 0, "results": []}  # No results found
 
         # --- 3. Enhance results with distribution details ---
-        enhanced_results = []
+        enhanced_results: List[Dict[str, Any]] = []
         dataset_uris = [
-            res.get("dataset", {}).get("value")
+            _binding_value(res, "dataset")
             for res in initial_results
             if res.get("dataset")
         ]
 
         # Fetch distributions for all datasets found in the initial search
-        distributions_by_dataset = {}
+        distributions_by_dataset: Dict[str, Dict[str, Dict[str, Optional[str]]]] = {}
         if dataset_uris:
             # Chunk dataset URIs if the list is very long to avoid overly long SPARQL queries
             chunk_size = 50  # Adjust as needed
+            dist_jobs: List[Tuple[str, str]] = []
             for i in range(0, len(dataset_uris), chunk_size):
                 chunk_uris = dataset_uris[i : i + chunk_size]
                 uri_values = " ".join(f"<{uri}>" for uri in chunk_uris if uri)
                 if not uri_values:
                     continue
 
-                dist_query = f"""
-                PREFIX dcat: <http://www.w3.org/ns/dcat#>
-                PREFIX dct: <http://purl.org/dc/terms/>
-
-                SELECT ?dataset ?dist ?format ?downloadURL ?accessURL ?mediaType ?byteSize WHERE {{
-                  VALUES ?dataset {{ {uri_values} }} # Filter for datasets in this chunk
-                  ?dataset dcat:distribution ?dist .
-                  OPTIONAL {{ ?dist dct:format ?formatURI . BIND(STR(?formatURI) AS ?format) }}
-                  OPTIONAL {{ ?dist dcat:downloadURL ?downloadURL . }}
-                  OPTIONAL {{ ?dist dcat:accessURL ?accessURL . }}
-                  OPTIONAL {{ ?dist dcat:mediaType ?mediaType . }}
-                  OPTIONAL {{ ?dist dcat:byteSize ?byteSize . }}
-                }} LIMIT 1000
-                """
-                # Use URI hash in cache key to distinguish chunks if needed, though results are combined later
-                dist_response = self._execute_sparql_query(
-                    dist_query, cache_key_suffix=f"dists_chunk_{i//chunk_size}"
+                dist_query = _DIST_CHUNK_QUERY_TEMPLATE.format_map(
+                    {"uri_values": uri_values}
                 )
+                # Use URI hash in cache key to distinguish chunks if needed, though results are combined later
+                dist_jobs.append((dist_query, f"dists_chunk_{i//chunk_size}"))
+
+            # Chunks are independent: cached ones are read in one lookup and
+            # the rest are fetched concurrently
+            dist_responses = self._execute_sparql_queries(dist_jobs)
+
+            for dist_response in dist_responses:
                 dist_results = dist_response.get("results", {}).get("bindings", [])
 
                 # Organize distributions by dataset URI
                 for res in dist_results:
-                    ds_uri = res.get("dataset", {}).get("value")
-                    dist_uri = res.get("dist", {}).get(
-                        "value"
-                    )  # Get dist URI to avoid duplicates
+                    ds_uri = _binding_value(res, "dataset")
+                    # Get dist URI to avoid duplicates
+                    dist_uri = _binding_value(res, "dist")
                     if not ds_uri or not dist_uri:
                         continue
 
                     dist = {
                         "uri": dist_uri,  # Include distribution URI
-                        "format": res.get("format", {}).get("value"),
-                        "mediaType": res.get("mediaType", {}).get("value"),
-                        "downloadURL": res.get("downloadURL", {}).get("value"),
-                        "accessURL": res.get("accessURL", {}).get("value"),
-                        "byteSize": res.get("byteSize", {}).get("value"),
+                        "format": _binding_value(res, "format"),
+                        "mediaType": _binding_value(res, "mediaType"),
+                        "downloadURL": _binding_value(res, "downloadURL"),
+                        "accessURL": _binding_value(res, "accessURL"),
+                        "byteSize": _binding_value(res, "byteSize"),
                     }
                     dist = {k: v for k, v in dist.items() if v}  # Remove empty keys
 
@@ -390,8 +1448,9 @@ class EUDataTool:
                             distributions_by_dataset[ds_uri][dist_uri] = dist
 
         # --- 4. Combine initial results with distributions ---
+        norm_preferred = [f.upper() for f in preferred_formats]
         for basic_result in initial_results:
-            dataset_uri = basic_result.get("dataset", {}).get("value")
+            dataset_uri = _binding_value(basic_result, "dataset")
             if not dataset_uri:
                 continue
 
@@ -400,55 +1459,42 @@ class EUDataTool:
             distributions = list(dataset_distributions_dict.values())
 
             # Find best download option based on preferred formats
-            best_download = None
-            norm_preferred = [f.upper() for f in preferred_formats]
-
-            for fmt_pref in norm_preferred:
-                if best_download:
-                    break
-                for dist in distributions:
-                    # Prioritize downloadURL, but consider accessURL if downloadURL is absent
-                    dist_url = dist.get("downloadURL") or dist.get("accessURL")
-                    if not dist_url:
-                        continue
+            best_download: Optional[Dict[str, Optional[str]]] = None
 
+            # Normalize what the format rules inspect once per distribution,
+            # not once per (preferred format, distribution) pair
+            candidates: List[
+                Tuple[Dict[str, Optional[str]], str, str, str, FrozenSet[str]]
+            ] = []
+            for dist in distributions:
+                # Prioritize downloadURL, but consider accessURL if downloadURL is absent
+                dist_url = dist.get("downloadURL") or dist.get("accessURL")
+                if dist_url:
                     format_value = (dist.get("format") or "").upper()
-                    media_type = (dist.get("mediaType") or "").upper()
-                    url_lower = dist_url.lower()
-
-                    # Use the same matching logic as in get_dataset_content
-                    matches_format = (
-                        (format_value and fmt_pref in format_value)
-                        or (
-                            media_type
-                            and any(
-                                f"/{fmt_pref}" in mt_part
-                                for mt_part in media_type.split("/")
-                            )
-                        )
-                        or any(
-                            ext in url_lower.split("?")[0].split("/")[-1]
-                            for ext in [
-                                f".{fmt_pref.lower()}",
-                                f"format={fmt_pref.lower()}",
-                            ]
-                        )
-                        or (
-                            fmt_pref == "RDF"
-                            and any(
-                                rdf_fmt in format_value
-                                for rdf_fmt in ["RDF", "XML", "TURTLE", "N3", "JSON-LD"]
-                            )
-                        )
-                        or (fmt_pref == "XML" and "XML" in media_type)
-                        or (fmt_pref == "JSON" and "JSON" in media_type)
-                        or (
-                            fmt_pref == "CSV"
-                            and ("CSV" in media_type or "csv" in format_value)
+                    url_tail = dist_url.lower().split("?", 1)[0].rsplit("/", 1)[-1]
+                    candidates.append(
+                        (
+                            dist,
+                            dist_url,
+                            format_value,
+                            url_tail,
+                            _known_formats(
+                                format_value,
+                                url_tail,
+                                _format_alias_formats(
+                                    format_value, (dist.get("mediaType") or "").upper()
+                                ),
+                            ),
                         )
                     )
 
-                    if matches_format:
+            for fmt_pref in norm_preferred:
+                if best_download:
+                    break
+                for dist, dist_url, format_value, url_tail, known_formats in candidates:
+                    if _matches_preferred_format(
+                        fmt_pref, format_value, url_tail, known_formats
+                    ):
                         best_download = {
                             "url": dist_url,
                             "format": dist.get("format") or fmt_pref,  # Best guess
@@ -458,30 +1504,26 @@ class EUDataTool:
                         break
 
             # Fallback: If no preferred format found, take the first distribution with a download/access URL
-            if not best_download:
-                for dist in distributions:
-                    dist_url = dist.get("downloadURL") or dist.get("accessURL")
-                    if dist_url:
-                        best_download = {
-                            "url": dist_url,
-                            "format": dist.get("format"),
-                            "mediaType": dist.get("mediaType"),
-                            "byteSize": dist.get("byteSize"),
-                        }
-                        break
+            if not best_download and candidates:
+                dist, dist_url = candidates[0][:2]
+                best_download = {
+                    "url": dist_url,
+                    "format": dist.get("format"),
+                    "mediaType": dist.get("mediaType"),
+                    "byteSize": dist.get("byteSize"),
+                }
+
+            keywords_value = _binding_value(basic_result, "keywords") or ""
+            keywords = [
+                kw for kw in keywords_value.split("|") if kw
+            ]  # Clean empty strings
 
             enhanced_dataset = {
                 "uri": dataset_uri,
-                "title": basic_result.get("title", {}).get("value"),
-                "publisher": basic_result.get("publisher", {}).get("value"),
-                "keywords": [
-                    kw
-                    for kw in basic_result.get("keywords", {})
-                    .get("value", "")
-                    .split("|")
-                    if kw
-                ],  # Clean empty strings
-                "modified": basic_result.get("modified", {}).get("value"),
+                "title": _binding_value(basic_result, "title"),
+                "publisher": _binding_value(basic_result, "publisher"),
+                "keywords": keywords,
+                "modified": _binding_value(basic_result, "modified"),
                 "distributions": distributions,
                 "download": best_download,  # May be None
             }
@@ -518,43 +1560,44 @@ class EUDataTool:
         final_metadata = None
         cache_to_use = None  # Will be set based on successful method
 
+        memo_key = (dataset_uri, locale)
+        if self.cache_enabled and not force_refresh:
+            cached_data = self._memo_get(memo_key)
+            if cached_data is not None:
+                logging.debug(f"Metadata memory cache hit for: {dataset_uri}")
+                return cached_data
+
         # --- Attempt 1: REST API (JSON-LD) ---
         # Check REST cache first
-        rest_cache_path = os.path.join(self.cache_dir, cache_key_rest + ".json")
-        if self.cache_enabled and not force_refresh and os.path.exists(rest_cache_path):
-            try:
-                with open(rest_cache_path, "r", encoding="utf-8") as f:
-                    cached_data = json.load(f)
-                cache_time = cached_data.get("_cache_timestamp", 0)
-                if time.time() - cache_time < self.cache_ttl:
-                    logging.info(
-                        f"Metadata cache hit (REST strategy) for: {dataset_uri}"
-                    )
-                    return {
-                        k: v for k, v in cached_data.items() if not k.startswith("_")
-                    }
-                else:
-                    logging.debug(
-                        f"Metadata cache expired (REST strategy) for: {dataset_uri}"
-                    )
-            except (json.JSONDecodeError, IOError, UnicodeDecodeError) as e:
-                logging.warning(
-                    f"Metadata cache read error for {rest_cache_path}: {e}. Attempting fetch."
-                )
-                try:
-                    os.remove(rest_cache_path)
-                except OSError:
-                    pass
+        validators = {}
+        if self.cache_enabled and not force_refresh:
+            cached_data = self._cache_get(cache_key_rest)
+            if cached_data is not None:
+                logging.info(f"Metadata cache hit (REST strategy) for: {dataset_uri}")
+                self._memo_put(memo_key, cached_data)
+                return cached_data
+            # An expired entry can still be revalidated instead of re-downloaded
+            validators = self._cache_validators(cache_key_rest)
 
         # Try fetching from REST API
-        metadata_from_rest = self._get_metadata_from_rest_api(dataset_uri, locale)
+        metadata_from_rest = self._get_metadata_from_rest_api(
+            dataset_uri, locale, validators
+        )
+        if metadata_from_rest and metadata_from_rest.get("_not_modified"):
+            cached_data = self._cache_refresh(cache_key_rest)
+            if cached_data is not None:
+                logging.info(f"Metadata not modified, cache renewed for: {dataset_uri}")
+                self._memo_put(memo_key, cached_data)
+                return cached_data
+            # The stale entry disappeared meanwhile, so fetch it in full
+            metadata_from_rest = self._get_metadata_from_rest_api(dataset_uri, locale)
 
         if metadata_from_rest and "error" not in metadata_from_rest:
             logging.info(
                 f"Successfully retrieved metadata via REST API for {dataset_uri}"
             )
             final_metadata = metadata_from_rest
-            cache_to_use = rest_cache_path  # Use the REST cache path
+            cache_to_use = cache_key_rest  # Use the REST cache key
         else:
             rest_error_msg = (
                 metadata_from_rest.get("error", "Unknown REST error")
@@ -567,37 +1610,14 @@ class EUDataTool:
 
             # --- Attempt 2: SPARQL Fallback ---
             # Check SPARQL fallback cache
-            sparql_cache_path = os.path.join(self.cache_dir, cache_key_sparql + ".json")
-            if (
-                self.cache_enabled
-                and not force_refresh
-                and os.path.exists(sparql_cache_path)
-            ):
-                try:
-                    with open(sparql_cache_path, "r", encoding="utf-8") as f:
-                        cached_data = json.load(f)
-                    cache_time = cached_data.get("_cache_timestamp", 0)
-                    if time.time() - cache_time < self.cache_ttl:
-                        logging.info(
-                            f"Metadata cache hit (SPARQL strategy) for: {dataset_uri}"
-                        )
-                        return {
-                            k: v
-                            for k, v in cached_data.items()
-                            if not k.startswith("_")
-                        }
-                    else:
-                        logging.debug(
-                            f"Metadata cache expired (SPARQL strategy) for: {dataset_uri}"
-                        )
-                except (json.JSONDecodeError, IOError, UnicodeDecodeError) as e:
-                    logging.warning(
-                        f"SPARQL fallback cache read error for {sparql_cache_path}: {e}. Fetching fresh."
+            if self.cache_enabled and not force_refresh:
+                cached_data = self._cache_get(cache_key_sparql)
+                if cached_data is not None:
+                    logging.info(
+                        f"Metadata cache hit (SPARQL strategy) for: {dataset_uri}"
                     )
-                    try:
-                        os.remove(sparql_cache_path)
-                    except OSError:
-                        pass
+                    self._memo_put(memo_key, cached_data)
+                    return cached_data
 
             # Fetch using SPARQL fallback
             metadata_from_sparql = self._get_metadata_from_sparql_fallback(
@@ -609,7 +1629,7 @@ class EUDataTool:
                     f"Successfully retrieved limited metadata via SPARQL fallback for {dataset_uri}"
                 )
                 final_metadata = metadata_from_sparql
-                cache_to_use = sparql_cache_path  # Use the SPARQL cache path
+                cache_to_use = cache_key_sparql  # Use the SPARQL cache key
             else:
                 sparql_error_msg = (
                     metadata_from_sparql.get("error", "Unknown SPARQL error")
@@ -626,20 +1646,24 @@ class EUDataTool:
 
         # --- Cache the final successful result ---
         if final_metadata and cache_to_use and self.cache_enabled:
-            metadata_to_cache = final_metadata.copy()
-            metadata_to_cache["_cache_timestamp"] = time.time()
-            try:
-                temp_file = cache_to_use + ".tmp"
-                with open(temp_file, "w", encoding="utf-8") as f:
-                    json.dump(metadata_to_cache, f, ensure_ascii=False)
-                os.replace(temp_file, cache_to_use)
+            response_validators = {
+                name: final_metadata[f"_{name}"]
+                for name in self._CACHE_VALIDATORS
+                if final_metadata.get(f"_{name}")
+            }
+            to_cache = {
+                k: v for k, v in final_metadata.items() if not k.startswith("_")
+            }
+            if self._cache_put(
+                cache_to_use,
+                to_cache,
+                response_validators,
+                scope=self._sanitize_filename(dataset_uri),
+            ):
                 logging.debug(
-                    f"Cached final metadata ({'REST' if cache_to_use == rest_cache_path else 'SPARQL'}) for: {dataset_uri}"
-                )
-            except IOError as e:
-                logging.error(
-                    f"Failed to write final metadata cache {cache_to_use}: {e}"
+                    f"Cached final metadata ({'REST' if cache_to_use == cache_key_rest else 'SPARQL'}) for: {dataset_uri}"
                 )
+            self._memo_put(memo_key, to_cache)
 
         # Return metadata without internal cache field
         if final_metadata:
@@ -648,25 +1672,44 @@ class EUDataTool:
             # Should have been caught earlier, but as a failsafe
             return {"error": "Metadata retrieval failed through all methods."}
 
+    def get_dataset_metadata_many(
+        self,
+        dataset_uris: List[str],
+        force_refresh: bool = False,
+        locale: str = "en",
+        max_workers: int = MAX_METADATA_WORKERS,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrieve metadata for several dataset URIs concurrently.
+
+        Each URI goes through `get_dataset_metadata` (cache, REST, SPARQL
+        fallback); with transport="httpx" the REST requests are multiplexed as
+        HTTP/2 streams over one connection. Requests remain subject to the
+        per-service rate limit.
+
+        Returns:
+            Dictionary mapping each URI to its metadata or error dictionary.
+        """
+        unique_uris = list(dict.fromkeys(dataset_uris))
+        if not unique_uris:
+            return {}
+        workers = max(1, min(len(unique_uris), max_workers))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                lambda uri: self.get_dataset_metadata(uri, force_refresh, locale),
+                unique_uris,
+            )
+            return dict(zip(unique_uris, results))
+
     def _extract_uuid_from_uri(self, dataset_uri: str) -> Optional[str]:
         """Extracts the UUID from known data.europa.eu URI patterns."""
         # Pattern for /data/datasets/{UUID} or /88u/dataset/{UUID} or /set/{UUID}
         # Example: http://data.europa.eu/88u/dataset/somerandom-uuid-goes-here
         # Example: https://data.europa.eu/data/datasets/somerandom-uuid-goes-here
         # Example: https://data.europa.eu/set/data/some-name-with-uuid-goes-here
-        match = re.search(
-            r"/(?:datasets|dataset|set/data)/([0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})",
-            dataset_uri,
-        )
-        if match:
-            return match.group(1)
-        # Check for pattern like /set/{UUID}/resource/...
-        match_set = re.search(
-            r"/set/([0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})(/|$)",
-            dataset_uri,
-        )
-        if match_set:
-            return match_set.group(1)
+        dataset_uuid = _extract_uuid(dataset_uri)
+        if dataset_uuid is not None:
+            return dataset_uuid
 
         logging.warning(f"Could not extract UUID from URI pattern: {dataset_uri}")
         return None
@@ -682,49 +1725,89 @@ class EUDataTool:
         Helper to extract value(s) from a JSON-LD node, handling language tags and lists.
         Returns a list if allow_list is True, otherwise a single value or None.
         """
+        if not allow_list:
+            # Single value: the preferred language match, or the first value found
+            return self._get_first_value(node, (property_uri,), prefer_locale)
+
         if node is None:
-            return [] if allow_list else None
+            return []
 
         value = node.get(property_uri)
         if value is None:
-            return [] if allow_list else None
+            return []
 
+        # Return all collected values, whatever their language
         results_list = []
-        preferred_result = None
-        any_result = None  # Fallback if preferred locale not found or not applicable
-
-        values_to_process = value if isinstance(value, list) else [value]
-
-        for item in values_to_process:
-            item_value = None
-            item_lang = None
-
+        for item in value if isinstance(value, list) else (value,):
             if isinstance(item, dict):
                 item_value = item.get("@value")  # Literal value
-                item_lang = item.get("@language")
                 if item_value is None:
                     item_value = item.get("@id")  # URI reference
             elif isinstance(item, str):  # Plain string (could be literal or URI)
                 item_value = item
-
+            else:
+                continue
             if item_value is not None:
                 results_list.append(item_value)
-                if prefer_locale and item_lang == prefer_locale:
-                    if preferred_result is None:  # Take the first preferred match
-                        preferred_result = item_value
-                if any_result is None:  # Take the first value found as a fallback
-                    any_result = item_value
-
-        if allow_list:
-            return results_list  # Return all collected values
-        else:
-            # Return preferred language match, or the first value found, or None
-            return preferred_result or any_result
+        return results_list
+
+    def _get_first_value(
+        self,
+        node: Optional[Dict],
+        properties: Tuple[str, ...],
+        prefer_locale: Optional[str] = "en",
+    ) -> Any:
+        """
+        Helper to extract a single value from the first of several properties of a
+        JSON-LD node, e.g. a name with label fallbacks. Properties keep their
+        priority: the first one holding a value wins, with its preferred language
+        value (or else its first value). Later properties are not looked at.
+        """
+        if node is None:
+            return None
+
+        # Titles and descriptions carry up to 24 translations, so stop at the match.
+        result = None
+        for property_uri in properties:
+            value = node.get(property_uri)
+            if value is None:
+                continue
+            result = None  # Fallback if preferred locale not found or not applicable
+            for item in value if isinstance(value, list) else (value,):
+                item_lang = None
+                if isinstance(item, dict):
+                    item_value = item.get("@value")  # Literal value
+                    item_lang = item.get("@language")
+                    if item_value is None:
+                        item_value = item.get("@id")  # URI reference
+                elif isinstance(item, str):  # Plain string (could be literal or URI)
+                    item_value = item
+                else:
+                    continue
+
+                if item_value is not None:
+                    if result is None:  # Take the first value found as a fallback
+                        result = item_value
+                    if prefer_locale and item_lang == prefer_locale:
+                        result = item_value or result
+                        break
+            if result:
+                return result
+        return result
 
     def _get_metadata_from_rest_api(
-        self, dataset_uri: str, locale: str
+        self,
+        dataset_uri: str,
+        locale: str,
+        validators: Optional[Dict[str, str]] = None,
     ) -> Optional[Dict[str, Any]]:
-        """Internal method to fetch and parse metadata using the REST API (JSON-LD)."""
+        """
+        Internal method to fetch and parse metadata using the REST API (JSON-LD).
+
+        With `validators` from an expired cache entry the request is conditional,
+        and {"_not_modified": True} is returned if the server answers 304.
+        The response's own validators come back as "_etag"/"_last_modified".
+        """
         dataset_uuid = self._extract_uuid_from_uri(dataset_uri)
         if not dataset_uuid:
             # Cannot use REST API without UUID
@@ -737,13 +1820,28 @@ class EUDataTool:
         api_url = f"{self.REST_API_BASE}{dataset_uuid}.jsonld?useNormalizedId=true&locale={locale}"
         logging.info(f"Attempting REST API fetch: {api_url}")
 
-        self._ensure_request_delay()
+        headers = self.headers
+        if validators:
+            headers = dict(headers)
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        self._ensure_request_delay(self.REST_API_BASE)
         try:
-            response = requests.get(
-                api_url, headers=self.headers, timeout=self.REQUEST_TIMEOUT
-            )
+            response: Union[requests.Response, httpx.Response]
+            if self._hclient is not None:
+                response = self._hclient.get(api_url, headers=headers)
+            else:
+                response = self._session.get(
+                    api_url, headers=headers, timeout=self.REQUEST_TIMEOUT
+                )
+            self._note_rate_limit(self.REST_API_BASE, response)
+            if response.status_code == 304 and validators:
+                return {"_not_modified": True}
             response.raise_for_status()
-            json_ld_data = response.json()
+            json_ld_data = _json_loads(response.content)
 
             # --- Parse JSON-LD Graph ---
             graph = json_ld_data.get("@graph")
@@ -754,93 +1852,89 @@ class EUDataTool:
 
             # Find the main dataset node and distribution nodes
             dataset_node = None
-            distribution_nodes = []
-            nodes_by_id = {
-                node.get("@id"): node
-                for node in graph
-                if node.get("@id") and isinstance(node, dict)
-            }
-
-            # Try to find the dataset node matching the input URI or containing the UUID
+            # Index the graph by @id and by @type in a single pass
+            nodes_by_id = {}
+            nodes_by_type = defaultdict(list)
             for node in graph:
                 if not isinstance(node, dict):
                     continue
-                node_type = node.get("@type", [])
-                node_id = node.get("@id", "")
-                # Check type and if ID matches original URI or contains the UUID
-                if "dcat:Dataset" in node_type and (
-                    node_id == dataset_uri or dataset_uuid in node_id
-                ):
+                node_id = node.get("@id")
+                if node_id:
+                    nodes_by_id[node_id] = node
+                node_types = node.get("@type", [])
+                if isinstance(node_types, str):
+                    node_types = [node_types]
+                for node_type in node_types:
+                    nodes_by_type[node_type].append(node)
+            dataset_nodes = nodes_by_type.get("dcat:Dataset", [])
+
+            # Try to find the dataset node matching the input URI or containing the UUID
+            for node in dataset_nodes:
+                node_id = node.get("@id") or ""
+                if node_id == dataset_uri or dataset_uuid in node_id:
                     dataset_node = node
                     break  # Found likely primary dataset node
 
             # Fallback: If no match, assume the first dcat:Dataset is the right one
             if not dataset_node:
-                for node in graph:
-                    if isinstance(node, dict) and "dcat:Dataset" in node.get(
-                        "@type", []
-                    ):
-                        dataset_node = node
-                        logging.warning(
-                            f"Could not directly match URI/UUID in dataset node ID, using first dcat:Dataset found: {dataset_node.get('@id')}"
-                        )
-                        break
-                if not dataset_node:
+                if not dataset_nodes:
                     return {
                         "error": f"Could not find dcat:Dataset node in @graph for UUID {dataset_uuid}. URL: {api_url}"
                     }
+                dataset_node = dataset_nodes[0]
+                logging.warning(
+                    f"Could not directly match URI/UUID in dataset node ID, using first dcat:Dataset found: {dataset_node.get('@id')}"
+                )
+
+            # Bound once for the many property lookups below
+            get_value = self._get_value
 
             # Find all distribution nodes associated with the dataset node
-            dist_uris = self._get_value(
-                dataset_node, "dcat:distribution", allow_list=True
-            )
+            dist_uris = get_value(dataset_node, "dcat:distribution", allow_list=True)
+            distribution_ids = {
+                node.get("@id") for node in nodes_by_type.get("dcat:Distribution", [])
+            }
+            # Keyed by @id so a distribution listed twice is only processed once
+            distribution_nodes: Dict[Any, Dict[str, Any]] = {}
             for dist_uri in dist_uris:
-                if isinstance(dist_uri, str) and dist_uri in nodes_by_id:
-                    dist_node = nodes_by_id[dist_uri]
-                    if isinstance(
-                        dist_node, dict
-                    ) and "dcat:Distribution" in dist_node.get("@type", []):
-                        distribution_nodes.append(dist_node)
+                if isinstance(dist_uri, str) and dist_uri in distribution_ids:
+                    distribution_nodes.setdefault(dist_uri, nodes_by_id[dist_uri])
                 # Handle distributions embedded directly (less common but possible)
                 elif isinstance(dist_uri, dict) and "dcat:Distribution" in dist_uri.get(
                     "@type", []
                 ):
-                    distribution_nodes.append(dist_uri)
+                    distribution_nodes.setdefault(
+                        dist_uri.get("@id") or id(dist_uri), dist_uri
+                    )
 
             # --- Extract Metadata ---
-            metadata = {
+            metadata: Dict[str, Any] = {
                 "uri": dataset_node.get("@id") or dataset_uri
             }  # Prefer ID from graph
 
-            metadata["title"] = self._get_value(
+            metadata["title"] = get_value(
                 dataset_node, "dct:title", prefer_locale=locale
             )
-            metadata["description"] = self._get_value(
+            metadata["description"] = get_value(
                 dataset_node, "dct:description", prefer_locale=locale
             )
-            metadata["modified"] = self._get_value(dataset_node, "dct:modified")
-            metadata["issued"] = self._get_value(
-                dataset_node, "dct:issued"
-            ) or self._get_value(dataset_node, "dct:created")
+            metadata["modified"] = get_value(dataset_node, "dct:modified")
+            metadata["issued"] = get_value(dataset_node, "dct:issued") or get_value(
+                dataset_node, "dct:created"
+            )
 
             # Publisher (might be URI needing lookup or direct object/string)
-            publisher_ref = self._get_value(dataset_node, "dct:publisher")
+            publisher_ref = get_value(dataset_node, "dct:publisher")
             if isinstance(publisher_ref, str) and publisher_ref.startswith(
                 "http"
             ):  # URI
                 publisher_node = nodes_by_id.get(publisher_ref)
                 if publisher_node:
                     # Try common properties for name
-                    metadata["publisher"] = (
-                        self._get_value(
-                            publisher_node, "foaf:name", prefer_locale=locale
-                        )
-                        or self._get_value(
-                            publisher_node, "skos:prefLabel", prefer_locale=locale
-                        )
-                        or self._get_value(
-                            publisher_node, "rdfs:label", prefer_locale=locale
-                        )
+                    metadata["publisher"] = self._get_first_value(
+                        publisher_node,
+                        ("foaf:name", "skos:prefLabel", "rdfs:label"),
+                        prefer_locale=locale,
                     )
                 else:
                     metadata["publisher"] = None  # Node not found
@@ -850,58 +1944,60 @@ class EUDataTool:
             elif isinstance(publisher_ref, str):  # Simple string name
                 metadata["publisher"] = publisher_ref
             elif isinstance(publisher_ref, dict):  # Embedded publisher object
-                metadata["publisher"] = self._get_value(
+                metadata["publisher"] = get_value(
                     publisher_ref, "foaf:name", prefer_locale=locale
                 )  # etc.
-                metadata["publisher_uri"] = self._get_value(publisher_ref, "@id")
+                metadata["publisher_uri"] = get_value(publisher_ref, "@id")
             else:
                 metadata["publisher"] = None
 
             # Multi-valued properties (get all as list)
-            metadata["keywords"] = self._get_value(
+            metadata["keywords"] = get_value(
                 dataset_node, "dcat:keyword", prefer_locale=locale, allow_list=True
             )
-            metadata["themes"] = self._get_value(
+            metadata["themes"] = get_value(
                 dataset_node, "dcat:theme", allow_list=True
             )  # URIs
-            metadata["languages"] = self._get_value(
+            metadata["languages"] = get_value(
                 dataset_node, "dct:language", allow_list=True
             )  # URIs
-            metadata["licenses"] = self._get_value(
+            metadata["licenses"] = get_value(
                 dataset_node, "dct:license", allow_list=True
             )  # URIs or embedded objects
 
             # Distributions
             metadata["distributions"] = []
-            processed_dist_ids = set()  # Avoid duplicates if graph has redundancy
 
-            for dist_node in distribution_nodes:
-                dist_id = dist_node.get("@id")
-                if dist_id and dist_id in processed_dist_ids:
-                    continue
-                if dist_id:
-                    processed_dist_ids.add(dist_id)
+            # Distributions usually share a handful of format/media type
+            # concepts, so each concept's label is looked up once
+            label_cache: Dict[str, Optional[str]] = {}
+
+            def resolve_label(concept_uri: str) -> Optional[str]:
+                if concept_uri not in label_cache:
+                    concept_node = nodes_by_id.get(concept_uri)
+                    label_cache[concept_uri] = self._get_first_value(
+                        concept_node,
+                        ("skos:prefLabel", "rdfs:label"),
+                        prefer_locale=locale,
+                    )
+                return label_cache[concept_uri]
 
+            for dist_node in distribution_nodes.values():
+                dist_id = dist_node.get("@id")
                 dist_data = {
                     "uri": dist_id,
-                    "title": self._get_value(
-                        dist_node, "dct:title", prefer_locale=locale
-                    ),
-                    "downloadURL": self._get_value(dist_node, "dcat:downloadURL"),
-                    "accessURL": self._get_value(dist_node, "dcat:accessURL"),
-                    "format": self._get_value(
-                        dist_node, "dct:format"
-                    ),  # URI or literal
-                    "mediaType": self._get_value(
+                    "title": get_value(dist_node, "dct:title", prefer_locale=locale),
+                    "downloadURL": get_value(dist_node, "dcat:downloadURL"),
+                    "accessURL": get_value(dist_node, "dcat:accessURL"),
+                    "format": get_value(dist_node, "dct:format"),  # URI or literal
+                    "mediaType": get_value(
                         dist_node, "dcat:mediaType"
                     ),  # URI or literal
-                    "byteSize": self._get_value(dist_node, "dcat:byteSize"),
-                    "modified": self._get_value(dist_node, "dct:modified"),
-                    "issued": self._get_value(dist_node, "dct:issued"),
-                    "license": self._get_value(
-                        dist_node, "dct:license"
-                    ),  # URI or literal
-                    "description": self._get_value(
+                    "byteSize": get_value(dist_node, "dcat:byteSize"),
+                    "modified": get_value(dist_node, "dct:modified"),
+                    "issued": get_value(dist_node, "dct:issued"),
+                    "license": get_value(dist_node, "dct:license"),  # URI or literal
+                    "description": get_value(
                         dist_node, "dct:description", prefer_locale=locale
                     ),
                 }
@@ -910,20 +2006,12 @@ class EUDataTool:
                 if isinstance(dist_data["format"], str) and dist_data[
                     "format"
                 ].startswith("http"):
-                    format_node = nodes_by_id.get(dist_data["format"])
-                    dist_data["format_label"] = self._get_value(
-                        format_node, "skos:prefLabel", prefer_locale=locale
-                    ) or self._get_value(
-                        format_node, "rdfs:label", prefer_locale=locale
-                    )
+                    dist_data["format_label"] = resolve_label(dist_data["format"])
 
                 if isinstance(dist_data["mediaType"], str) and dist_data[
                     "mediaType"
                 ].startswith("http"):
-                    mt_node = nodes_by_id.get(dist_data["mediaType"])
-                    dist_data["mediaType_label"] = self._get_value(
-                        mt_node, "skos:prefLabel", prefer_locale=locale
-                    ) or self._get_value(mt_node, "rdfs:label", prefer_locale=locale)
+                    dist_data["mediaType_label"] = resolve_label(dist_data["mediaType"])
 
                 # Add only distributions with some useful info (e.g., a URL or URI)
                 cleaned_dist = {k: v for k, v in dist_data.items() if v is not None}
@@ -934,20 +2022,28 @@ class EUDataTool:
                 ):
                     metadata["distributions"].append(cleaned_dist)
 
+            metadata["_etag"] = response.headers.get("ETag")
+            metadata["_last_modified"] = response.headers.get("Last-Modified")
+
             # Clean top-level None values and empty lists before returning
             return {k: v for k, v in metadata.items() if v is not None and v != []}
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, httpx.HTTPError) as e:
             error_msg = f"REST API request failed: {str(e)}"
-            if e.response is not None:
-                error_msg += f" - Status Code: {e.response.status_code}"
+            # Only status errors carry a response with httpx
+            error_response = getattr(e, "response", None)
+            if error_response is not None:
+                error_msg += f" - Status Code: {error_response.status_code}"
                 try:
-                    error_msg += f" - Response: {e.response.text[:500]}"
+                    error_detail = error_response.content[:512].decode(
+                        "utf-8", "replace"
+                    )
+                    error_msg += f" - Response: {error_detail}"
                 except Exception:
                     pass
             logging.error(f"{error_msg} for URL: {api_url}")
             return {"error": error_msg}
-        except (json.JSONDecodeError, AttributeError, KeyError, TypeError) as e:
+        except (ValueError, AttributeError, KeyError, TypeError) as e:
             error_msg = f"Failed to parse REST API JSON-LD response: {str(e)}"
             logging.error(
                 f"{error_msg} for URL: {api_url}", exc_info=True
@@ -961,7 +2057,7 @@ class EUDataTool:
     def _get_metadata_from_sparql_fallback(
         self, dataset_uri: str, force_refresh: bool
     ) -> Dict[str, Any]:
-        """Internal method for SPARQL fallback using multiple simple queries."""
+        """Internal method for SPARQL fallback using a few combined queries."""
         logging.info(f"Executing SPARQL fallback for {dataset_uri}")
 
         # --- Use the original dataset URI directly in SPARQL queries ---
@@ -970,117 +2066,43 @@ class EUDataTool:
         sparql_uri = dataset_uri
         logging.debug(f"Using SPARQL URI: {sparql_uri}")
 
-        metadata = {
+        metadata: Dict[str, Any] = {
             "uri": dataset_uri,
             "sparql_uri_used": sparql_uri,
         }  # Store original and SPARQL URI used
         combined_errors = []
 
-        # --- Define simple queries ---
-        # Using placeholder <URI> which will be replaced by sparql_uri
-        # select_agg is used for MAX aggregates
-        # is_multi indicates if multiple values are expected
-        queries = {
-            "title": (
-                'dct:title ?value . FILTER(LANGMATCHES(LANG(?value), "en") || LANG(?value) = "")',
-                False,
-                "dct",
-                None,
-            ),
-            "description": (
-                'dct:description ?value . FILTER(LANGMATCHES(LANG(?value), "en") || LANG(?value) = "")',
-                False,
-                "dct",
-                None,
-            ),
-            "publisherName": (
-                'dct:publisher ?p . OPTIONAL { ?p foaf:name ?value . } OPTIONAL { ?p rdfs:label ?value . FILTER(LANGMATCHES(LANG(?value), "en") || LANG(?value) = "") } OPTIONAL { ?p skos:prefLabel ?value . FILTER(LANGMATCHES(LANG(?value), "en") || LANG(?value) = "") } FILTER(BOUND(?value))',
-                False,
-                "dct foaf rdfs skos",
-                None,
-            ),
-            "publisherUri": (
-                "dct:publisher ?value . FILTER(ISURI(?value))",
-                False,
-                "dct",
-                None,
-            ),  # Get publisher URI too
-            "modified": (
-                "dct:modified ?date .",
-                False,
-                "dct",
-                "(MAX(?date) AS ?value)",
-            ),  # Aggregate
-            "issued": (
-                "dct:issued ?date .",
-                False,
-                "dct",
-                "(MAX(?date) AS ?value)",
-            ),  # Aggregate
-            "keywords": ("dcat:keyword ?value .", True, "dcat", None),
-            "themes": (
-                "dcat:theme ?value . FILTER(ISURI(?value))",
-                True,
-                "dcat",
-                None,
-            ),  # Theme URIs
-            "languages": (
-                "dct:language ?value . FILTER(ISURI(?value))",
-                True,
-                "dct",
-                None,
-            ),  # Language URIs
-            "licenses": (
-                "dct:license ?value .",
-                True,
-                "dct",
-                None,
-            ),  # License URIs or Literals
-        }
-        prefixes = {
-            "dct": "PREFIX dct: <http://purl.org/dc/terms/>\n",
-            "foaf": "PREFIX foaf: <http://xmlns.com/foaf/0.1/>\n",
-            "skos": "PREFIX skos: <http://www.w3.org/2004/02/skos/core#>\n",
-            "rdfs": "PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>\n",
-            "dcat": "PREFIX dcat: <http://www.w3.org/ns/dcat#>\n",
-        }
+        # --- Build core property queries ---
+        # One query for all single-valued properties and one for all
+        # multi-valued ones, instead of one query per property
+        sanitized_uri = self._sanitize_filename(sparql_uri)
+        jobs = []
+        for group, template in _FALLBACK_PROPERTY_TEMPLATES.items():
+            query = template.format_map({"sparql_uri": sparql_uri})
+            # Unique cache suffix for each property query
+            prop_cache_suffix = f"sparql_prop_{sanitized_uri}_{group}"
+            jobs.append((query, prop_cache_suffix))
 
-        # --- Execute core property queries ---
-        for prop_name, (pattern, is_multi, req_prefixes, select_agg) in queries.items():
-            # Determine the variable name in the pattern (usually ?value or ?date for aggregates)
-            var_match = re.search(r"\?(\w+)\s*\.", pattern)
-            variable_in_pattern = (
-                var_match.group(0)[:-2] if var_match else "?value"
-            )  # e.g. ?value or ?date
-
-            # Construct SELECT clause
-            select_expr = select_agg if select_agg else variable_in_pattern
-
-            # Grouping needed for aggregate functions like MAX
-            group_by_clause = "GROUP BY ?dataset" if select_agg else ""
-            # Need to bind the dataset URI for grouping
-            where_clause = f"BIND(<{sparql_uri}> AS ?dataset) . ?dataset {pattern}"
-
-            # Build necessary prefixes string
-            query_prefixes = "".join(
-                prefixes[p] for p in req_prefixes.split() if p in prefixes
-            )
+        # The distribution query is built up front so it travels in the same batch
+        dist_query = _FALLBACK_DIST_QUERY_TEMPLATE.format_map(
+            {"sparql_uri": sparql_uri}
+        )
+        dist_cache_suffix = f"sparql_dist_{sanitized_uri}"
+        jobs.append((dist_query, dist_cache_suffix))
 
-            query = f"""
-                {query_prefixes}
-                SELECT {select_expr}
-                WHERE {{ {where_clause} }}
-                {group_by_clause}
-                LIMIT {200 if is_multi else 1}
-            """
-            # Unique cache suffix for each property query
-            prop_cache_suffix = (
-                f"sparql_prop_{self._sanitize_filename(sparql_uri)}_{prop_name}"
-            )
-            response = self._execute_sparql_query(
-                query, force_refresh=force_refresh, cache_key_suffix=prop_cache_suffix
-            )
+        # The queries are independent, so they are fetched concurrently
+        # (cached ones come from a single lookup)
+        *prop_responses, dist_response = self._execute_sparql_queries(
+            jobs, force_refresh=force_refresh, scope=sanitized_uri
+        )
 
+        # --- Process core property results ---
+        for is_multi, response in zip((False, True), prop_responses):
+            prop_names = [
+                name
+                for name, (_, multi, _, _) in _FALLBACK_PROPERTY_QUERIES.items()
+                if multi is is_multi
+            ]
             # Check response structure before accessing results
             if (
                 isinstance(response, dict)
@@ -1092,23 +2114,26 @@ class EUDataTool:
                 bindings = []  # Treat invalid response structure as no results
 
             if isinstance(response, dict) and "error" in response:
-                error_msg = f"Failed to fetch SPARQL property '{prop_name}': {response['error']}"
+                error_msg = f"Failed to fetch SPARQL properties {', '.join(prop_names)}: {response['error']}"
                 combined_errors.append(error_msg)
                 logging.warning(error_msg + f" for {sparql_uri}")
-                metadata[f"error_{prop_name}"] = error_msg  # Add specific error
+                for prop_name in prop_names:
+                    metadata[f"error_{prop_name}"] = error_msg  # Add specific error
             elif bindings:
-                target_var = "value"  # The name used in SELECT (or AS alias)
-                if is_multi:
-                    metadata[prop_name] = [
-                        b.get(target_var, {}).get("value")
-                        for b in bindings
-                        if b.get(target_var, {}).get("value")
-                    ]
-                elif bindings[0].get(
-                    target_var
-                ):  # Check if the target variable exists in the first binding
-                    metadata[prop_name] = bindings[0].get(target_var, {}).get("value")
-            # else: No bindings found, property remains absent from metadata dict
+                # The aggregates yield a single row; unbound properties are absent
+                row = bindings[0]
+                for prop_name in prop_names:
+                    value = _binding_value(row, prop_name)
+                    if not value:
+                        continue  # Property remains absent from metadata dict
+                    if is_multi:
+                        # Empty values are skipped
+                        values = [v for v in value.split(_MULTI_VALUE_SEPARATOR) if v]
+                        del values[_MULTI_VALUE_LIMIT:]
+                        if values:
+                            metadata[prop_name] = values
+                    else:
+                        metadata[prop_name] = value
 
         # Use publisherName as publisher if available, otherwise keep None/URI
         metadata["publisher"] = metadata.pop("publisherName", None) or metadata.get(
@@ -1120,26 +2145,7 @@ class EUDataTool:
         else:
             metadata.pop("publisherUri", None)  # Remove helper URI if name was found
 
-        # --- Execute distribution query ---
-        dist_query = f"""
-            PREFIX dcat: <http://www.w3.org/ns/dcat#>
-            PREFIX dct: <http://purl.org/dc/terms/>
-            SELECT DISTINCT ?dist ?downloadURL ?accessURL ?distTitle ?format_str ?mediaType ?byteSize
-            WHERE {{
-              <{sparql_uri}> dcat:distribution ?dist .
-              OPTIONAL {{ ?dist dcat:downloadURL ?downloadURL . }}
-              OPTIONAL {{ ?dist dcat:accessURL ?accessURL . }}
-              OPTIONAL {{ ?dist dct:title ?distTitle . FILTER(LANGMATCHES(LANG(?distTitle), "en") || LANG(?distTitle) = "") }}
-              OPTIONAL {{ ?dist dct:format ?formatURI . BIND(COALESCE(STR(?formatURI), "") AS ?format_str) }} # Handle unbound format
-              OPTIONAL {{ ?dist dcat:mediaType ?mediaType . }}
-              OPTIONAL {{ ?dist dcat:byteSize ?byteSize . }}
-            }} ORDER BY ?dist LIMIT 200
-        """
-        dist_cache_suffix = f"sparql_dist_{self._sanitize_filename(sparql_uri)}"
-        dist_response = self._execute_sparql_query(
-            dist_query, force_refresh=force_refresh, cache_key_suffix=dist_cache_suffix
-        )
-
+        # --- Process distribution results ---
         metadata["distributions"] = []  # Initialize even if query fails
 
         if (
@@ -1159,38 +2165,30 @@ class EUDataTool:
             logging.warning(error_msg + f" for {sparql_uri}")
             metadata["error_distributions"] = error_msg  # Add specific error
         else:
-            # Process distributions
-            processed_dist_uris = set()
+            # Process distributions, keyed by URI to skip repeated rows
+            distributions_by_uri = {}
             for row in dist_bindings:
-                dist_uri = row.get("dist", {}).get("value")
+                dist_uri = _binding_value(row, "dist")
                 # Ensure we have a dist_uri and haven't processed it
-                if dist_uri and dist_uri not in processed_dist_uris:
+                if dist_uri and dist_uri not in distributions_by_uri:
                     dist_data = {
                         "uri": dist_uri,
-                        "downloadURL": row.get("downloadURL", {}).get("value"),
-                        "accessURL": row.get("accessURL", {}).get("value"),
-                        "title": row.get("distTitle", {}).get("value"),
-                        "format": row.get("format_str", {}).get(
-                            "value"
-                        ),  # Use format_str from BIND/COALESCE
-                        "mediaType": row.get("mediaType", {}).get("value"),
-                        "byteSize": row.get("byteSize", {}).get("value"),
+                        "downloadURL": _binding_value(row, "downloadURL"),
+                        "accessURL": _binding_value(row, "accessURL"),
+                        "title": _binding_value(row, "distTitle"),
+                        # Use format_str from BIND/COALESCE
+                        "format": _binding_value(row, "format_str"),
+                        "mediaType": _binding_value(row, "mediaType"),
+                        "byteSize": _binding_value(row, "byteSize"),
                     }
-                    # Add only non-empty values
-                    cleaned_dist = {
+                    # Add only non-empty values; the URI is always among them
+                    distributions_by_uri[dist_uri] = {
                         k: v for k, v in dist_data.items() if v is not None and v != ""
                     }
-                    # Add if it has at least a URI or a URL
-                    if (
-                        cleaned_dist.get("uri")
-                        or cleaned_dist.get("downloadURL")
-                        or cleaned_dist.get("accessURL")
-                    ):
-                        metadata["distributions"].append(cleaned_dist)
-                        processed_dist_uris.add(dist_uri)
+            metadata["distributions"] = list(distributions_by_uri.values())
 
         # Check if *any* data beyond URI was fetched
-        core_data_keys = set(queries.keys()) | {"publisher"}
+        core_data_keys = set(_FALLBACK_PROPERTY_QUERIES) | {"publisher"}
         core_data_found = any(k in metadata for k in core_data_keys)
 
         if (
@@ -1283,97 +2281,54 @@ class EUDataTool:
         selected_format_label = None  # The format identifier (label, URI, or literal)
         norm_preferred = [f.upper() for f in preferred_formats]
 
+        # Normalize what the format rules inspect once per distribution,
+        # not once per (preferred format, distribution) pair
+        candidates = []
+        for dist in distributions:
+            # Prioritize downloadURL, fallback to accessURL
+            # Some accessURLs might point to landing pages, not direct downloads
+            target_url = dist.get("downloadURL") or dist.get("accessURL")
+            if not target_url:
+                continue
+            # Format info might be a URI, a label (present if REST found one
+            # for the URI) or a plain string; match on the most specific one
+            format_label = dist.get("format_label") or dist.get("format")
+            format_value = (format_label or "").upper()
+            url_tail = target_url.lower().split("?", 1)[0].rsplit("/", 1)[-1]
+            candidates.append(
+                (
+                    dist,
+                    format_label,
+                    format_value,
+                    url_tail,
+                    _known_formats(
+                        format_value,
+                        url_tail,
+                        _content_alias_formats(
+                            format_value, (dist.get("mediaType") or "").upper()
+                        ),
+                    ),
+                )
+            )
+
         for fmt_pref in norm_preferred:
             if selected_dist:
                 break
-            for dist in distributions:
-                # Prioritize downloadURL, fallback to accessURL
-                # Some accessURLs might point to landing pages, not direct downloads
-                target_url = dist.get("downloadURL") or dist.get("accessURL")
-                if not target_url:
-                    continue
-
-                # Extract format info carefully (might be URI, label, or plain string)
-                format_val = dist.get("format")  # Could be URI or literal
-                format_label = dist.get(
-                    "format_label"
-                )  # Present if REST found label for URI
-                media_type = (dist.get("mediaType") or "").upper()
-                # Use the most specific format info available for matching
-                format_string_for_match = (format_label or format_val or "").upper()
-
-                url_lower = target_url.lower()
-
-                # Consistent matching logic
-                matches_format = (
-                    (format_string_for_match and fmt_pref in format_string_for_match)
-                    or (
-                        media_type
-                        and any(
-                            f"/{fmt_pref}" in mt_part
-                            for mt_part in media_type.split("/")
-                        )
-                    )
-                    or
-                    # Check file extension or format parameter in URL
-                    any(
-                        ext in url_lower.split("?")[0].split("/")[-1]
-                        for ext in [
-                            f".{fmt_pref.lower()}",
-                            f"?format={fmt_pref.lower()}",
-                            f"&format={fmt_pref.lower()}",
-                        ]
-                    )
-                    or
-                    # Specific type matching
-                    (
-                        fmt_pref == "RDF"
-                        and any(
-                            rdf_fmt in format_string_for_match
-                            for rdf_fmt in [
-                                "RDF",
-                                "XML",
-                                "TURTLE",
-                                "N3",
-                                "JSON-LD",
-                                "OWL",
-                            ]
-                        )
-                    )
-                    or (
-                        fmt_pref == "XML"
-                        and ("XML" in media_type or "XML" in format_string_for_match)
-                    )
-                    or (
-                        fmt_pref == "JSON"
-                        and ("JSON" in media_type or "JSON" in format_string_for_match)
-                    )
-                    or (
-                        fmt_pref == "CSV"
-                        and (
-                            "CSV" in media_type
-                            or "CSV" in format_string_for_match
-                            or "comma-separated" in format_string_for_match
-                        )
-                    )
-                )
-
-                if matches_format:
+            for dist, format_label, format_value, url_tail, known_formats in candidates:
+                if _matches_preferred_format(
+                    fmt_pref, format_value, url_tail, known_formats
+                ):
                     selected_dist = dist
                     # Store the best available format identifier
-                    selected_format_label = format_label or format_val or fmt_pref
+                    selected_format_label = format_label or fmt_pref
                     break
 
         # Fallback: If no preferred format found, take first distribution with a download/access URL
-        if not selected_dist:
-            for dist in distributions:
-                target_url = dist.get("downloadURL") or dist.get("accessURL")
-                if target_url:
-                    selected_dist = dist
-                    selected_format_label = dist.get("format_label") or dist.get(
-                        "format", "unknown"
-                    )
-                    break
+        if not selected_dist and candidates:
+            selected_dist = candidates[0][0]
+            selected_format_label = selected_dist.get(
+                "format_label"
+            ) or selected_dist.get("format", "unknown")
 
         if not selected_dist:
             return {
@@ -1387,20 +2342,24 @@ class EUDataTool:
         logging.info(f"Selected distribution URL for download: {download_url}")
 
         # --- 3. Check content cache ---
-        # Cache key based on the specific download URL being used
-        content_cache_key = self._sanitize_filename(f"content_{download_url}")
+        # Cache key based on the specific download URL being used; hashed, as
+        # sanitized URLs can exceed NAME_MAX or collide once truncated (the URL
+        # itself is kept as "source_url" in the .meta)
+        content_cache_key = (
+            "content_"
+            + hashlib.blake2b(download_url.encode("utf-8"), digest_size=16).hexdigest()
+        )
         cache_path = os.path.join(self.cache_dir, content_cache_key + ".content")
         meta_path = cache_path + ".meta"
 
-        if (
-            self.cache_enabled
-            and not force_refresh
-            and os.path.exists(cache_path)
-            and os.path.exists(meta_path)
-        ):
+        # Metadata of an expired or stale entry whose validators let the
+        # download below be conditional
+        revalidate_metadata = None
+        if self.cache_enabled and not force_refresh:
+            # Opened directly rather than checked first, saving a stat per file
             try:
-                with open(meta_path, "r", encoding="utf-8") as f:
-                    content_metadata = json.load(f)
+                with open(meta_path, "rb") as meta_file:
+                    content_metadata = _json_loads(meta_file.read())
 
                 cache_time = content_metadata.get("_cache_timestamp", 0)
                 dataset_mod_cached = content_metadata.get("dataset_modified")
@@ -1417,146 +2376,229 @@ class EUDataTool:
 
                 if not is_expired and not is_stale:
                     logging.info(f"Cache hit for content: {download_url}")
-                    is_binary = content_metadata.get("is_binary", False)
-                    mode = "rb" if is_binary else "r"
-                    encoding = (
-                        None if is_binary else "utf-8"
-                    )  # Assume UTF-8 for text cache
-                    with open(cache_path, mode, encoding=encoding) as f:
-                        content = f.read()
-
-                    return {
-                        "content": content,
-                        "format": content_metadata.get(
-                            "format"
-                        ),  # Format stored in cache meta
-                        "content_type": content_metadata.get("content_type"),
-                        "is_binary": is_binary,
-                        "size": content_metadata.get("size"),
-                        "source_url": content_metadata.get("source_url"),
-                    }
+                    return self._read_cached_content(cache_path, content_metadata)
                 else:
                     logging.info(
                         f"Content cache {'expired' if is_expired else 'stale'} for: {download_url}"
                     )
+                    if content_metadata.get("etag") or content_metadata.get(
+                        "last_modified"
+                    ):
+                        revalidate_metadata = content_metadata
 
-            except (json.JSONDecodeError, IOError, UnicodeDecodeError) as e:
+            except FileNotFoundError:
+                pass  # Not cached yet
+            except _CORRUPT_PAYLOAD_ERRORS + (
+                IOError,
+            ) as e:  # Includes JSON, Unicode and zstd decode errors
                 logging.warning(
                     f"Content cache read error for {cache_path}: {e}. Fetching fresh data."
                 )
-                try:  # Attempt cleanup of corrupted cache files
-                    if os.path.exists(cache_path):
-                        os.remove(cache_path)
-                    if os.path.exists(meta_path):
-                        os.remove(meta_path)
-                except OSError:
-                    pass
+                for path in (cache_path, meta_path):  # Clean up corrupted cache files
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
 
         # --- 4. Download content ---
-        self._ensure_request_delay()
+        download_host = urlsplit(download_url).netloc
         logging.info(f"Downloading content from: {download_url}")
+
+        def fetch(
+            headers: Dict[str, str],
+        ) -> Union[requests.Response, httpx.Response]:
+            # Downloads go through the pooled clients, so repeated downloads
+            # from one host reuse its connection (multiplexed with httpx)
+            self._ensure_request_delay(download_host)
+            response: Union[requests.Response, httpx.Response]
+            if self._hclient is not None:
+                request = self._hclient.build_request(
+                    "GET",
+                    download_url,
+                    headers=headers,
+                    timeout=self.REQUEST_TIMEOUT * 2,
+                )
+                response = self._hclient.send(request, stream=True)
+            else:
+                response = self._session.get(
+                    download_url,
+                    headers=headers,
+                    timeout=self.REQUEST_TIMEOUT
+                    * 2,  # Longer timeout for potential large downloads
+                    stream=True,  # Use stream to read content type before loading all
+                    allow_redirects=True,  # Follow redirects
+                )
+            self._note_rate_limit(download_host, response)
+            return response
+
+        def iter_chunks(
+            response: Union[requests.Response, httpx.Response],
+        ) -> Iterator[bytes]:
+            if isinstance(response, httpx.Response):
+                return response.iter_bytes(1 << 16)
+            return response.iter_content(chunk_size=1 << 16)
+
+        # Use general class headers, not SPARQL specific ones
+        headers = self.headers
+        if revalidate_metadata:
+            # Ask the server to skip the body if the cached copy is current
+            headers = dict(headers)
+            if revalidate_metadata.get("etag"):
+                headers["If-None-Match"] = revalidate_metadata["etag"]
+            if revalidate_metadata.get("last_modified"):
+                headers["If-Modified-Since"] = revalidate_metadata["last_modified"]
+        response = None
         try:
-            # Use general class headers, not SPARQL specific ones
-            response = requests.get(
-                download_url,
-                headers=self.headers,
-                timeout=self.REQUEST_TIMEOUT
-                * 2,  # Longer timeout for potential large downloads
-                stream=True,  # Use stream to read content type before loading all
-                allow_redirects=True,  # Follow redirects
-            )
+            response = fetch(headers)
+            if response.status_code == 304 and revalidate_metadata:
+                response.close()
+                logging.info(f"Content not modified, reusing cache: {download_url}")
+                revalidate_metadata["dataset_modified"] = dataset_metadata.get(
+                    "modified"
+                )
+                revalidate_metadata["_cache_timestamp"] = time.time()
+                try:
+                    _atomic_write(meta_path, _json_dumps(revalidate_metadata))
+                    return self._read_cached_content(cache_path, revalidate_metadata)
+                except _CORRUPT_PAYLOAD_ERRORS + (IOError,) as e:
+                    # The cached copy vanished or broke meanwhile; fetch it in full
+                    logging.warning(
+                        f"Content cache read error for {cache_path}: {e}. Fetching fresh data."
+                    )
+                    response = fetch(self.headers)
             response.raise_for_status()
 
             # Determine if binary based on Content-Type header
             content_type = response.headers.get("Content-Type", "").lower()
-            # Refined binary check (common text types)
-            is_binary = not any(
-                ct in content_type
-                for ct in [
-                    "text",
-                    "json",
-                    "xml",
-                    "csv",
-                    "html",
-                    "rdf",
-                    "turtle",
-                    "n3",
-                    "sparql-results",
-                    "ld+json",
-                ]
+            is_binary = _TEXT_CONTENT_TYPE_RE.search(content_type) is None
+            raw_chunks = iter_chunks(response)
+            # Sample the first chunk to settle what the headers leave open
+            # before committing to a text or binary path for the whole body
+            sample = next(raw_chunks, b"")
+            if sample:
+                raw_chunks = itertools.chain((sample,), raw_chunks)
+            # Read from the headers as requests does, for either client
+            detected_encoding = (
+                requests.utils.get_encoding_from_headers(response.headers) or "utf-8"
             )
+            if not is_binary:
+                if "charset=" not in content_type:
+                    if b"\x00" in sample:  # Never part of undeclared text
+                        is_binary = True
+                    elif _is_utf8_prefix(sample):
+                        # Without a charset requests assumes ISO-8859-1 for text/*
+                        detected_encoding = "utf-8"
+            elif (
+                sample
+                and content_type.split(";", 1)[0].strip() in _GENERIC_CONTENT_TYPES
+                and b"\x00" not in sample
+                and _is_utf8_prefix(sample)
+            ):
+                is_binary = False  # e.g. a CSV served as application/octet-stream
+                detected_encoding = "utf-8"
             logging.debug(
                 f"Detected Content-Type: {content_type}, Is binary: {is_binary}"
             )
 
-            # Read content into memory
-            content = response.content
-
-            # Try to decode if not detected as binary
+            # Text is decoded as it arrives, so the raw body is never held
+            # in memory next to its decoded copy
+            decoder = None
             if not is_binary:
-                detected_encoding = (
-                    response.encoding or "utf-8"
-                )  # Use detected or default to utf-8
                 logging.debug(
                     f"Attempting to decode as text using encoding: {detected_encoding}"
                 )
                 try:
-                    text_content = content.decode(detected_encoding, errors="replace")
-                    content = text_content  # Use decoded string if successful
-                    logging.debug("Successfully decoded content as text.")
-                except (UnicodeDecodeError, LookupError) as decode_err:
+                    decoder = codecs.getincrementaldecoder(detected_encoding)(
+                        errors="replace"
+                    )
+                except LookupError as decode_err:
                     logging.warning(
                         f"Could not decode content from {download_url} as text ({detected_encoding}), treating as binary. Error: {decode_err}"
                     )
                     is_binary = True  # Revert to binary if decoding fails
 
+            text_parts: List[str] = []
+
+            def encoded_text_chunks(
+                decoder: codecs.IncrementalDecoder,
+            ) -> Iterator[bytes]:
+                # Collects the decoded text, yielding it as UTF-8 for the cache
+                for chunk in raw_chunks:
+                    text_parts.append(decoder.decode(chunk))
+                    yield text_parts[-1].encode("utf-8")
+                text_parts.append(decoder.decode(b"", final=True))
+                yield text_parts[-1].encode("utf-8")
+
+            body = raw_chunks if decoder is None else encoded_text_chunks(decoder)
+            # Text distributions (CSV, JSON, XML...) shrink several times under
+            # zstd; binary ones are mostly compressed formats already
+            compression = (
+                "zstd" if decoder is not None and zstandard is not None else None
+            )
+            # Set once the whole body has been read
+            content: Optional[Union[str, bytes]] = None
+
             # --- 5. Cache downloaded content ---
             if self.cache_enabled:
-                content_metadata_to_cache = {
-                    "format": selected_format_label,  # Store the determined format
-                    "content_type": content_type,
-                    "is_binary": is_binary,
-                    "size": len(
-                        content
-                    ),  # Store actual size (bytes for binary, chars for text)
-                    "source_url": download_url,
-                    "dataset_modified": dataset_metadata.get(
-                        "modified"
-                    ),  # Store dataset mod date for staleness check
-                    "_cache_timestamp": time.time(),
-                }
                 try:
-                    # Save content
-                    mode = "wb" if is_binary else "w"
-                    encoding = (
-                        None if is_binary else "utf-8"
-                    )  # Always cache text as UTF-8
-                    temp_content_file = cache_path + ".tmp"
-                    with open(temp_content_file, mode, encoding=encoding) as f:
-                        f.write(content)
-                    os.replace(temp_content_file, cache_path)
+                    # Stream the body straight into the cache file (text is
+                    # always cached as UTF-8)
+                    _atomic_write(
+                        cache_path, body if compression is None else _zstd_stream(body)
+                    )
+                    if is_binary:
+                        with open(cache_path, "rb") as f:
+                            content = f.read()
+                    else:
+                        content = "".join(text_parts)
 
+                    content_metadata_to_cache = {
+                        "format": selected_format_label,  # Store the determined format
+                        "content_type": content_type,
+                        "is_binary": is_binary,
+                        "compression": compression,
+                        "size": len(
+                            content
+                        ),  # Store actual size (bytes for binary, chars for text)
+                        "source_url": download_url,
+                        "dataset_modified": dataset_metadata.get(
+                            "modified"
+                        ),  # Store dataset mod date for staleness check
+                        # Validators for a conditional download once this expires
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                        "_cache_timestamp": time.time(),
+                    }
                     # Save metadata
-                    temp_meta_file = meta_path + ".tmp"
-                    with open(temp_meta_file, "w", encoding="utf-8") as f:
-                        json.dump(content_metadata_to_cache, f, ensure_ascii=False)
-                    os.replace(temp_meta_file, meta_path)
+                    _atomic_write(meta_path, _json_dumps(content_metadata_to_cache))
+                    self._index_add(
+                        self._sanitize_filename(dataset_uri),
+                        (os.path.basename(cache_path), os.path.basename(meta_path)),
+                    )
 
                     logging.info(f"Cached content from: {download_url}")
+                except requests.exceptions.RequestException:
+                    # The body is read from the network while it is written, and
+                    # requests' stream errors are IOErrors too: a broken download
+                    # must fail the call, not pass as a cache write failure
+                    raise
                 except IOError as e:
                     logging.error(f"Failed to write content cache {cache_path}: {e}")
-                except Exception as e:  # Catch potential encoding errors during write
-                    logging.error(
-                        f"Failed to write content cache {cache_path} due to unexpected error: {e}"
-                    )
-                    # Attempt to clean up temp files if write failed
-                    try:
-                        if os.path.exists(temp_content_file):
-                            os.remove(temp_content_file)
-                        if os.path.exists(temp_meta_file):
-                            os.remove(temp_meta_file)
-                    except OSError:
+                    if is_binary and content is None:
+                        # The chunks streamed so far are gone with the failed
+                        # file, so fetch the body again
+                        response.close()
+                        response = fetch(self.headers)
+                        response.raise_for_status()
+                        body = iter_chunks(response)
+
+            if content is None:
+                if is_binary:
+                    content = b"".join(body)
+                else:
+                    for _ in body:  # Decode whatever the cache write left
                         pass
+                    content = "".join(text_parts)
 
             return {
                 "content": content,
@@ -1567,10 +2609,12 @@ class EUDataTool:
                 "source_url": download_url,
             }
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, httpx.HTTPError) as e:
             error_msg = f"Failed to download content from {download_url}: {str(e)}"
-            if e.response is not None:
-                error_msg += f" - Status Code: {e.response.status_code}"
+            # Only status errors carry a response with httpx
+            error_response = getattr(e, "response", None)
+            if error_response is not None:
+                error_msg += f" - Status Code: {error_response.status_code}"
             logging.error(error_msg)
             return {"error": error_msg}
         except (
@@ -1581,14 +2625,79 @@ class EUDataTool:
             )
             logging.error(error_msg, exc_info=True)
             return {"error": error_msg}
+        finally:
+            if response is not None:
+                # Hands the connection back to the pool even if the body was
+                # not read to the end (errors, refetches)
+                response.close()
+
+    def get_dataset_content_many(
+        self,
+        dataset_uris: List[str],
+        preferred_formats: Optional[List[str]] = None,
+        force_refresh: bool = False,
+        max_workers: int = MAX_CONTENT_WORKERS,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrieve content for several dataset URIs concurrently.
+
+        Each URI goes through `get_dataset_content` (metadata, format
+        selection, content cache). Downloads remain subject to the per-host
+        rate limit.
+
+        Returns:
+            Dictionary mapping each URI to its content or error dictionary.
+        """
+        unique_uris = list(dict.fromkeys(dataset_uris))
+        if not unique_uris:
+            return {}
+        workers = max(1, min(len(unique_uris), max_workers))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                lambda uri: self.get_dataset_content(
+                    uri, preferred_formats, force_refresh
+                ),
+                unique_uris,
+            )
+            return dict(zip(unique_uris, results))
+
+    @staticmethod
+    def _read_cached_content(
+        cache_path: str, content_metadata: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build a get_dataset_content result from a cached content file and its metadata."""
+        is_binary = content_metadata.get("is_binary", False)
+        content: Union[str, bytes]
+        if content_metadata.get("compression") == "zstd":
+            if zstandard is None:
+                raise ValueError(
+                    "Cached content is zstd-compressed but zstandard is missing"
+                )
+            with open(cache_path, "rb") as f:
+                content = zstandard.ZstdDecompressor().stream_reader(f).read()
+            if not is_binary:
+                content = content.decode("utf-8")  # Text is cached as UTF-8
+        else:
+            mode = "rb" if is_binary else "r"
+            encoding = None if is_binary else "utf-8"  # Assume UTF-8 for text cache
+            with open(cache_path, mode, encoding=encoding) as f:
+                content = f.read()
+
+        return {
+            "content": content,
+            "format": content_metadata.get("format"),  # Format stored in cache meta
+            "content_type": content_metadata.get("content_type"),
+            "is_binary": is_binary,
+            "size": content_metadata.get("size"),
+            "source_url": content_metadata.get("source_url"),
+        }
 
     def clear_cache(self, dataset_uri: Optional[str] = None):
         """
         Clear the cache.
 
-        If dataset_uri is provided, attempts to clear cached metadata (REST & SPARQL)
-        and related SPARQL sub-queries for that specific URI. Clearing specific content
-        cache is complex and not fully implemented; use full clear for content.
+        If dataset_uri is provided, clears cached metadata (REST & SPARQL), the
+        related SPARQL sub-queries and downloaded content for that specific URI.
 
         If dataset_uri is None, clears the entire cache directory.
         """
@@ -1602,85 +2711,100 @@ class EUDataTool:
             )
             # --- Clear Metadata Caches ---
             meta_cache_key_base = self._sanitize_filename(f"metadata_{dataset_uri}")
-            # Clear known metadata cache patterns (add more locales if used)
+            # Entries written before the cache index existed are only
+            # found under the default locale's keys
             for suffix in ["_rest_en", "_sparql"]:
-                filename = meta_cache_key_base + suffix + ".json"
-                cache_path = os.path.join(self.cache_dir, filename)
-                if os.path.exists(cache_path):
-                    try:
-                        os.remove(cache_path)
-                        logging.debug(f"Removed metadata cache file: {filename}")
-                    except OSError as e:
-                        logging.warning(
-                            f"Could not remove cache file {cache_path}: {e}"
-                        )
+                if self._cache_delete(meta_cache_key_base + suffix):
+                    logging.debug(
+                        f"Removed metadata cache entry: {meta_cache_key_base + suffix}"
+                    )
 
-            # --- Clear SPARQL Sub-Query Caches (Heuristic) ---
-            # Used by SPARQL fallback for properties and distributions
+            # --- Clear Indexed Entries ---
+            # Metadata in any locale, the SPARQL fallback's property and
+            # distribution queries and downloaded content are recorded under
+            # the sanitized dataset URI when written
             sanitized_uri = self._sanitize_filename(dataset_uri)
-            prefixes_to_clear = [
-                f"sparql_prop_{sanitized_uri}_",
-                f"sparql_dist_{sanitized_uri}",
-            ]
+            scopes = [sanitized_uri]
             # Also check for 88u format pattern if applicable (though primary uses original URI now)
             dataset_uuid = self._extract_uuid_from_uri(dataset_uri)
             if dataset_uuid:
                 sanitized_uri_88u = self._sanitize_filename(
                     f"http://data.europa.eu/88u/dataset/{dataset_uuid}"
                 )
-                prefixes_to_clear.extend(
-                    [
-                        f"sparql_prop_{sanitized_uri_88u}_",
-                        f"sparql_dist_{sanitized_uri_88u}",
-                    ]
-                )
+                if sanitized_uri_88u != sanitized_uri:
+                    scopes.append(sanitized_uri_88u)
 
-            removed_sub_caches = 0
-            for filename in os.listdir(self.cache_dir):
-                for prefix in prefixes_to_clear:
-                    if filename.startswith(prefix) and filename.endswith(".json"):
-                        cache_path = os.path.join(self.cache_dir, filename)
-                        if os.path.isfile(cache_path):
-                            try:
-                                os.remove(cache_path)
-                                logging.debug(
-                                    f"Removed SPARQL sub-cache file: {filename}"
-                                )
-                                removed_sub_caches += 1
-                            except OSError as e:
-                                logging.warning(
-                                    f"Could not remove cache file {cache_path}: {e}"
-                                )
-                            break  # Move to next filename once prefix matched
-
-            logging.debug(f"Removed {removed_sub_caches} SPARQL sub-cache files.")
-
-            # --- Content Cache Clearing ---
-            # Clearing specific content cache is difficult as keys depend on download URLs,
-            # which are only known after fetching metadata.
-            logging.warning(
-                "Clearing specific content cache by dataset URI is not reliably implemented. "
-                "To clear content cache, clear the entire cache or manually delete '.content' and '.meta' files."
-            )
+            removed_entries = 0
+            for name in self._index_pop(scopes):
+                if name.endswith((".content", ".meta")):
+                    file_path = os.path.join(self.cache_dir, name)
+                    try:
+                        os.remove(file_path)
+                        removed_entries += 1
+                    except FileNotFoundError:
+                        pass
+                    except OSError as e:
+                        logging.warning(f"Could not remove cache file {file_path}: {e}")
+                elif self._cache_delete(name):
+                    logging.debug(f"Removed indexed cache entry: {name}")
+                    removed_entries += 1
+
+            logging.debug(f"Removed {removed_entries} indexed cache entries and files.")
+
+            with self._memo_lock:
+                for memo_key in [k for k in self._memo if k[0] == dataset_uri]:
+                    del self._memo[memo_key]
 
             logging.info(f"Finished attempting to clear cache for {dataset_uri}.")
 
         else:
             # --- Clear Entire Cache Directory ---
             logging.info(f"Clearing all cache files in directory: {self.cache_dir}")
+            with self._memo_lock:
+                self._memo.clear()
             cleared_files = 0
             failed_files = 0
-            for filename in os.listdir(self.cache_dir):
-                file_path = os.path.join(self.cache_dir, filename)
+            if self._db is not None:
+                # Empty the table rather than unlinking a database that is open
+                with self._db_lock:
+                    self._db.execute("DELETE FROM cache")
+                    self._db.execute("DELETE FROM cache_index")
+                    self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            # Directory entries carry their file type, so no stat per file
+            paths = []
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    if self._db is not None and entry.name.startswith(
+                        self.CACHE_DB_NAME
+                    ):
+                        continue  # The database itself and its -wal/-shm files
+                    try:
+                        if entry.is_file(follow_symlinks=False) or entry.is_symlink():
+                            paths.append(entry.path)
+                        # Optionally clear subdirectories if any were created (none currently)
+                        # elif entry.is_dir(follow_symlinks=False): shutil.rmtree(entry.path)
+                    except OSError as e:
+                        failed_files += 1
+                        logging.error(f"Failed to delete {entry.path}. Reason: {e}")
+
+            def unlink(path: str) -> Optional[OSError]:
                 try:
-                    if os.path.isfile(file_path) or os.path.islink(file_path):
-                        os.unlink(file_path)
-                        cleared_files += 1
-                    # Optionally clear subdirectories if any were created (none currently)
-                    # elif os.path.isdir(file_path): shutil.rmtree(file_path)
-                except Exception as e:
-                    failed_files += 1
-                    logging.error(f"Failed to delete {file_path}. Reason: {e}")
+                    os.unlink(path)
+                except OSError as e:
+                    return e
+                return None
+
+            # A cache with many downloads holds thousands of files; unlink
+            # them in parallel rather than one syscall after another
+            if paths:
+                workers = min(len(paths), self.MAX_CLEAR_WORKERS)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    for path, error in zip(paths, executor.map(unlink, paths)):
+                        if error is None:
+                            cleared_files += 1
+                        else:
+                            failed_files += 1
+                            logging.error(f"Failed to delete {path}. Reason: {error}")
 
             if failed_files == 0:
                 logging.info(f"Successfully cleared {cleared_files} files from cache.")
@@ -1,7 +1,11 @@
 from dataclasses import dataclass
-import ollama
 import asyncio
-from typing import List, Dict, Any, Union
+import ollama
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncGenerator, Callable, List, Dict, Any, Optional, Tuple, Union
+
+# Papéis aceites pela API de chat do Ollama; os restantes passam a "user"
+_VALID_ROLES = frozenset(("user", "assistant", "system", "tool"))
 
 
 @dataclass
@@ -10,45 +14,161 @@ class Message:
 
 
 class OllamaModel:
+    MAX_BATCH_WORKERS = 8
+
     def __init__(self, model_name: str) -> None:
         self.model_name = model_name
+        # O cliente mantém um pool httpx com conexões keep-alive, partilhado
+        # por todas as chamadas (incluindo as concorrentes de `batch_call`)
         self.client = ollama.Client()
+        # O pool httpx do cliente assíncrono fica preso ao event loop em que
+        # foi usado, e cada `asyncio.run` cria um loop novo; por isso há um
+        # cliente por loop, fechado quando esse loop termina (ver `_closer`)
+        self._async_clients: Dict[
+            asyncio.AbstractEventLoop,
+            Tuple[ollama.AsyncClient, AsyncGenerator[None, None]],
+        ] = {}
 
     def __call__(
         self, messages: List[Union[str, Dict[str, Any]]], **kwargs: Any
     ) -> Message:
-        """Método de chamada síncrona"""
-        formatted_messages = self._format_messages(messages)
-        response: Dict[str, Any] = self.client.chat(
+        """Método de chamada síncrona
+
+        Aceita `stop_sequences` (repassado ao Ollama como `stop`) e `on_token`,
+        chamado com cada fragmento da resposta; se devolver False, a geração
+        é interrompida e devolve-se o texto recebido até aí.
+        """
+        return self._chat(
+            self._format_messages(messages),
+            stop_sequences=kwargs.get("stop_sequences"),
+            on_token=kwargs.get("on_token"),
+        )
+
+    def batch_call(
+        self,
+        batch: List[List[Union[str, Dict[str, Any]]]],
+        max_workers: int = MAX_BATCH_WORKERS,
+    ) -> List[Message]:
+        """Envia várias conversas em simultâneo e devolve as respostas pela mesma ordem.
+
+        O Ollama não tem um endpoint de geração em lote, por isso os pedidos
+        seguem em paralelo pelo pool de conexões do cliente, e o servidor
+        pode processá-los concorrentemente (ver OLLAMA_NUM_PARALLEL).
+        """
+        if not batch:
+            return []
+        formatted = [self._format_messages(messages) for messages in batch]
+        workers = min(len(formatted), max_workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self._chat, formatted))
+
+    def _chat(
+        self,
+        formatted_messages: List[Dict[str, Any]],
+        stop_sequences: Optional[List[str]] = None,
+        on_token: Optional[Callable[[str], Any]] = None,
+    ) -> Message:
+        # Em streaming o texto chega à medida que é gerado, em vez de o
+        # servidor o acumular por inteiro antes de responder
+        stream: Any = self.client.chat(
             model=self.model_name,
             messages=formatted_messages,
-            options={"temperature": 0.7, "stream": False},
+            options=self._options(stop_sequences),
+            stream=True,
         )
-        return Message(content=response.get("message", {}).get("content", ""))
+        parts: List[str] = []
+        try:
+            for chunk in stream:
+                token = chunk.get("message", {}).get("content") or ""
+                parts.append(token)
+                if on_token is not None and on_token(token) is False:
+                    break
+        finally:
+            stream.close()  # Fecha a ligação se a geração foi interrompida
+        return Message(content="".join(parts))
+
+    @staticmethod
+    def _options(stop_sequences: Optional[List[str]]) -> Dict[str, Any]:
+        options: Dict[str, Any] = {"temperature": 0.7}
+        if stop_sequences:
+            options["stop"] = list(stop_sequences)
+        return options
 
     async def acall(
         self, messages: List[Union[str, Dict[str, Any]]], **kwargs: Any
     ) -> Message:
-        """Método de chamada assíncrona"""
+        """Método de chamada assíncrona (mesmos argumentos que `__call__`)"""
         formatted_messages = self._format_messages(messages)
-        loop = asyncio.get_event_loop()
-        response: Dict[str, Any] = await loop.run_in_executor(
-            None,
-            lambda: self.client.chat(
-                model=self.model_name,
-                messages=formatted_messages,
-                options={"temperature": 0.7, "stream": False},
-            ),
+        on_token = kwargs.get("on_token")
+        # Cliente assíncrono nativo: a corrotina cede o controlo durante o I/O
+        # em vez de ocupar uma thread do executor por cada pedido
+        stream: Any = await (await self._get_async_client()).chat(
+            model=self.model_name,
+            messages=formatted_messages,
+            options=self._options(kwargs.get("stop_sequences")),
+            stream=True,
         )
-        return Message(content=response.get("message", {}).get("content", ""))
+        parts: List[str] = []
+        try:
+            async for chunk in stream:
+                token = chunk.get("message", {}).get("content") or ""
+                parts.append(token)
+                if on_token is not None and on_token(token) is False:
+                    break
+        finally:
+            await stream.aclose()  # Fecha a ligação se a geração foi interrompida
+        return Message(content="".join(parts))
+
+    async def _get_async_client(self) -> ollama.AsyncClient:
+        loop = asyncio.get_running_loop()
+        entry = self._async_clients.get(loop)
+        if entry is None:
+            client = ollama.AsyncClient()
+            # Um gerador assíncrono iniciado dentro do loop fica registado nele,
+            # e `asyncio.run` fecha-os (correndo o `finally`) antes de fechar o loop
+            closer = self._closer(client)
+            await closer.__anext__()
+            entry = self._async_clients[loop] = (client, closer)
+        return entry[0]
+
+    async def _closer(self, client: ollama.AsyncClient) -> AsyncGenerator[None, None]:
+        """Mantém-se suspenso até o loop terminar ou `aclose`, e fecha o cliente"""
+        try:
+            yield
+        finally:
+            loop = asyncio.get_running_loop()
+            entry = self._async_clients.get(loop)
+            if entry is not None and entry[0] is client:
+                del self._async_clients[loop]
+            await client.close()
+
+    async def aclose(self) -> None:
+        """Fecha os clientes assíncronos criados por `acall`
+
+        Cada cliente é fechado no seu próprio loop: no atual diretamente, e nos
+        que correm noutras threads através de `run_coroutine_threadsafe`. Os de
+        loops já fechados são descartados; os de loops parados fecham quando
+        esse loop terminar.
+        """
+        current = asyncio.get_running_loop()
+        for loop, (_, closer) in list(self._async_clients.items()):
+            if loop is current:
+                await closer.aclose()
+            elif loop.is_closed():
+                self._async_clients.pop(loop, None)
+            elif loop.is_running():
+                future = asyncio.run_coroutine_threadsafe(closer.aclose(), loop)
+                await asyncio.wrap_future(future)
 
     def _format_messages(
         self, messages: List[Union[str, Dict[str, Any]]]
     ) -> List[Dict[str, Any]]:
         formatted_messages: List[Dict[str, Any]] = []
+        # Históricos de agentes longos passam por aqui em cada chamada
+        append = formatted_messages.append
         for msg in messages:
             if isinstance(msg, str):
-                formatted_messages.append(
+                append(
                     {
                         "role": "user",  # Padrão para 'user' em strings simples
                         "content": msg,
@@ -63,18 +183,14 @@ class OllamaModel:
                         for part in content
                         if isinstance(part, dict) and "text" in part
                     )
-                formatted_messages.append(
+                append(
                     {
-                        "role": (
-                            role
-                            if role in ["user", "assistant", "system", "tool"]
-                            else "user"
-                        ),
+                        "role": role if role in _VALID_ROLES else "user",
                         "content": content,
                     }
                 )
             else:
-                formatted_messages.append(
+                append(
                     {
                         "role": "user",  # Papel padrão para tipos inesperados
                         "content": str(msg),
@@ -0,0 +1,9 @@
+import pytest
+
+from smolagents_helpers.ollama_model import OllamaModel
+
+
+@pytest.fixture(scope="session")
+def ollama_model():
+    """Fixture providing one OllamaModel (and its HTTP client) for the whole session"""
+    return OllamaModel(model_name="phi4:14b-q4_K_M")
@@ -1,18 +1,24 @@
 import pytest
 from smolagents import CodeAgent
 
-from smolagents_helpers.ollama_model import OllamaModel
 from smolagents_helpers.brave_search_tool import BraveSearchTool
 
 
-@pytest.mark.live
-def test_with_real_services():
-    """Run manually against real APIs"""
-    real_agent = CodeAgent(
-        model=OllamaModel(model_name="phi4:14b-q4_K_M"),
+@pytest.fixture
+def real_agent(ollama_model):
+    """Fixture providing a fresh CodeAgent on the shared session model"""
+    search_tool = BraveSearchTool()
+    yield CodeAgent(
+        model=ollama_model,
         add_base_tools=True,
-        tools=[BraveSearchTool()],
+        tools=[search_tool],
     )
+    search_tool.close()
+
+
+@pytest.mark.live
+def test_with_real_services(real_agent):
+    """Run manually against real APIs"""
     response = real_agent.run("Current weather in Tokyo")
     try:
         if isinstance(response, str):
@@ -0,0 +1,47 @@
+import asyncio
+import pytest
+
+from smolagents_helpers.brave_search_tool import BraveSearchTool
+
+
+@pytest.fixture
+def search_tool():
+    """Fixture providing a BraveSearchTool configured from the environment"""
+    tool = BraveSearchTool()
+    if not tool.api_key:
+        pytest.skip("BRAVE_SEARCH_API_KEY not configured")
+    yield tool
+    tool.close()
+
+
+@pytest.mark.live
+class TestLiveBraveSearchTool:
+    """Live API tests for BraveSearchTool (will hit the real Brave Search API)"""
+
+    TEST_QUERIES = ["Python smolagents", "data.europa.eu open data"]
+
+    def test_forward(self, search_tool):
+        """Test a single synchronous search"""
+        results = search_tool.forward(self.TEST_QUERIES[0], count=3)
+
+        assert isinstance(results, list)
+        assert 0 < len(results) <= 3
+        assert {"title", "url", "description"} <= set(results[0])
+
+    def test_aforward_concurrent(self, search_tool):
+        """Test that several async searches can be gathered concurrently"""
+
+        async def run():
+            try:
+                return await asyncio.gather(
+                    *(search_tool.aforward(q, count=2) for q in self.TEST_QUERIES)
+                )
+            finally:
+                await search_tool.aclose()
+
+        batches = asyncio.run(run())
+
+        assert len(batches) == len(self.TEST_QUERIES)
+        for results in batches:
+            assert isinstance(results, list)
+            assert len(results) <= 2
@@ -1,4 +1,5 @@
 import pytest
+import sqlite3
 import time
 
 from smolagents_helpers.eu_data_tool import EUDataTool
@@ -6,17 +7,35 @@ from smolagents_helpers.eu_data_tool import EUDataTool
 
 @pytest.fixture
 def mock_requests(monkeypatch):
-    """Fixture to patch requests.get with verify=False"""
+    """Fixture to patch the tool's pooled requests session with verify=False"""
     # Import the same requests instance that the module uses
     from smolagents_helpers.eu_data_tool import requests
 
-    original_get = requests.get
+    original_request = requests.Session.request
 
-    def patched_get(*args, **kwargs):
+    def patched_request(self, *args, **kwargs):
         kwargs["verify"] = False
-        return original_get(*args, **kwargs)
+        return original_request(self, *args, **kwargs)
 
-    monkeypatch.setattr(requests, "get", patched_get)
+    monkeypatch.setattr(requests.Session, "request", patched_request)
+
+
+def cache_entry_count(tmp_path):
+    """Count the entries stored in the tool's SQLite cache database"""
+    db = sqlite3.connect(tmp_path / "eu_data_cache" / EUDataTool.CACHE_DB_NAME)
+    try:
+        return db.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+    finally:
+        db.close()
+
+
+def content_cache_files(tmp_path):
+    """List cache files on disk other than the SQLite database itself"""
+    return [
+        path
+        for path in tmp_path.glob("eu_data_cache/*")
+        if not path.name.startswith(EUDataTool.CACHE_DB_NAME)
+    ]
 
 
 @pytest.fixture
@@ -93,9 +112,8 @@ class TestLiveEUDataTool:
         metadata1 = data_tool.get_dataset_metadata(self.TEST_DATASET_URI)
         first_call_time = time.time() - start_time
 
-        # Verify cache file was created
-        cache_files = list(tmp_path.glob("eu_data_cache/*.json"))
-        assert len(cache_files) == 1
+        # Verify a cache entry was created
+        assert cache_entry_count(tmp_path) == 1
 
         # Second call - should use cache
         start_time = time.time()
@@ -153,27 +171,24 @@ class TestLiveEUDataTool:
         """Test cache clearing functionality"""
         # Populate cache
         data_tool.get_dataset_metadata(self.TEST_DATASET_URI)
-        cache_files = list(tmp_path.glob("eu_data_cache/*.json"))
-        assert len(cache_files) > 0
+        assert cache_entry_count(tmp_path) > 0
 
         # Clear specific dataset cache
         data_tool.clear_cache(self.TEST_DATASET_URI)
-        cache_files = list(tmp_path.glob("eu_data_cache/*.json"))
-        assert len(cache_files) == 0
+        assert cache_entry_count(tmp_path) == 0
 
         # Test full cache clear
         # Populate cache again
         data_tool.get_dataset_metadata(self.TEST_DATASET_URI)
         data_tool.search_datasets(keyword=self.TEST_KEYWORD, limit=1)
 
-        # Should have at least 2 cache files now
-        cache_files = list(tmp_path.glob("eu_data_cache/*"))
-        assert len(cache_files) >= 2
+        # Should have at least 2 cache entries now
+        assert cache_entry_count(tmp_path) >= 2
 
         # Clear everything
         data_tool.clear_cache()
-        cache_files = list(tmp_path.glob("eu_data_cache/*"))
-        assert len(cache_files) == 0
+        assert cache_entry_count(tmp_path) == 0
+        assert content_cache_files(tmp_path) == []
 
     def test_search_with_pagination(self, data_tool):
         """Test that pagination parameters work correctly"""
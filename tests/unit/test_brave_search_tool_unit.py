@@ -0,0 +1,323 @@
+import io
+import json
+import os
+import pickle
+
+import httpx
+import pytest
+import requests
+import urllib3
+
+from smolagents_helpers import brave_search_tool
+from smolagents_helpers.brave_search_tool import BraveSearchTool, _TTLCache
+
+WEB_RESULT = {
+    "title": "Smolagents",
+    "url": "https://example.org/smolagents",
+    "description": "Agents that think in code",
+}
+WEB_BODY = (
+    b'{"web": {"results": [{"title": "Smolagents", '
+    b'"url": "https://example.org/smolagents", '
+    b'"description": "Agents that think in code"}]}}'
+)
+
+
+def make_response(body, status=200):
+    """Build a requests Response whose body is read through urllib3, like a live one"""
+    response = requests.Response()
+    response.status_code = status
+    response.url = "https://api.search.brave.com/res/v1/web/search"
+    response.raw = urllib3.HTTPResponse(
+        body=io.BytesIO(body), status=status, preload_content=False
+    )
+    return response
+
+
+@pytest.fixture
+def search_tool():
+    """Fixture providing a BraveSearchTool with a dummy key and no network access"""
+    tool = BraveSearchTool(api_key="test-key")
+    yield tool
+    tool.close()
+
+
+@pytest.fixture
+def fake_get(search_tool, monkeypatch):
+    """Fixture replacing the pooled session's GET; records the keyword arguments of each call"""
+    calls = []
+
+    def get(url, **kwargs):
+        calls.append(kwargs)
+        return make_response(WEB_BODY)
+
+    monkeypatch.setattr(search_tool._session, "get", get)
+    return calls
+
+
+class TestForward:
+    """Offline tests for BraveSearchTool.forward, with the HTTP client mocked"""
+
+    def test_requests_transport(self, search_tool, fake_get):
+        """Test a search over the pooled requests session"""
+        results = search_tool.forward("smolagents", count=50)
+
+        assert results == [WEB_RESULT]
+        assert fake_get[0]["params"]["q"] == "smolagents"
+        assert fake_get[0]["params"]["count"] == 20  # Capped at the API limit
+        assert fake_get[0]["headers"]["X-Subscription-Token"] == "test-key"
+
+    def test_httpx_transport(self):
+        """Test a search over the HTTP/2 httpx client"""
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request)
+            return httpx.Response(200, content=WEB_BODY)
+
+        tool = BraveSearchTool(api_key="test-key", transport="httpx")
+        tool._hclient.close()
+        tool._hclient = httpx.Client(transport=httpx.MockTransport(handler))
+        try:
+            assert tool.forward("smolagents") == [WEB_RESULT]
+        finally:
+            tool.close()
+
+        assert requests_seen[0].url.params["q"] == "smolagents"
+        assert requests_seen[0].headers["X-Subscription-Token"] == "test-key"
+
+    def test_streamed_results(self, monkeypatch):
+        """Test that stream_results parses the body incrementally with ijson"""
+        pytest.importorskip("ijson")
+        tool = BraveSearchTool(api_key="test-key", stream_results=True)
+        monkeypatch.setattr(
+            tool._session, "get", lambda url, **kwargs: make_response(WEB_BODY)
+        )
+        try:
+            assert tool.forward("smolagents") == [WEB_RESULT]
+        finally:
+            tool.close()
+
+    def test_http_error(self, search_tool, monkeypatch):
+        """Test that an error status is reported as a RuntimeError"""
+        monkeypatch.setattr(
+            search_tool._session,
+            "get",
+            lambda url, **kwargs: make_response(b"{}", status=500),
+        )
+
+        with pytest.raises(RuntimeError, match="Search request failed"):
+            search_tool.forward("smolagents")
+
+
+class TestTTLCache:
+    """Offline tests for the in-memory search result cache"""
+
+    def test_entries_expire(self, monkeypatch):
+        """Test that an entry is dropped once it is older than the TTL"""
+        now = [1000.0]
+        monkeypatch.setattr(brave_search_tool.time, "monotonic", lambda: now[0])
+        cache = _TTLCache(maxsize=4, ttl=10)
+        cache.set("key", "value")
+
+        now[0] += 9.9
+        assert cache.get("key") == "value"
+        now[0] += 0.1
+        assert cache.get("key") is None
+        assert "key" not in cache._data
+
+    def test_least_recently_used_is_evicted(self):
+        """Test that the cache evicts the entry read least recently"""
+        cache = _TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_zero_maxsize_disables_caching(self):
+        """Test that maxsize=0 stores nothing"""
+        cache = _TTLCache(maxsize=0, ttl=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") is None
+
+    def test_forward_answers_repeats_from_cache(self, search_tool, fake_get):
+        """Test that an identical search is served without a second request"""
+        first = search_tool.forward("smolagents")
+        second = search_tool.forward("smolagents")
+        search_tool.forward("smolagents", country="DE")
+
+        assert first == second == [WEB_RESULT]
+        assert len(fake_get) == 2
+
+
+class TestParseBody:
+    """Offline tests for decoding buffered response bodies"""
+
+    def test_body_without_web_section_is_not_decoded(self, search_tool, monkeypatch):
+        """Test that a body lacking a web section skips the JSON decoder"""
+
+        def fail(body):
+            raise AssertionError("decoder should not run")
+
+        monkeypatch.setattr(brave_search_tool, "_json_loads", fail)
+
+        assert search_tool._parse_body(b'{"query": {"original": "x"}}') == []
+        assert search_tool._parse_body(b' \n{"query": {}}\r\n') == []
+
+    def test_body_with_web_section(self, search_tool):
+        """Test that a body with web results is decoded and formatted"""
+        assert search_tool._parse_body(WEB_BODY) == [WEB_RESULT]
+
+    def test_invalid_body_still_fails(self, search_tool):
+        """Test that a malformed body mentioning "web" raises a decode error"""
+        with pytest.raises(brave_search_tool._DECODE_ERRORS):
+            search_tool._parse_body(b'{"web": ')
+
+    def test_non_json_body_fails(self, search_tool):
+        """Test that a non-JSON body (e.g. an HTML error page) raises a decode error"""
+        with pytest.raises(brave_search_tool._DECODE_ERRORS):
+            search_tool._parse_body(b"<html><body>Bad gateway</body></html>")
+
+
+class TestConfigure:
+    """Offline tests for saving the API key"""
+
+    def test_writes_private_config(self, search_tool, tmp_path):
+        """Test that the key is written to a private file with no temp file left over"""
+        search_tool.config_path = str(tmp_path / "config" / "brave.json")
+
+        assert search_tool.configure("new-key") is True
+
+        with open(search_tool.config_path) as f:
+            assert json.load(f) == {"api_key": "new-key"}
+        assert os.stat(search_tool.config_path).st_mode & 0o777 == 0o600
+        assert os.listdir(tmp_path / "config") == ["brave.json"]
+        assert search_tool.api_key == "new-key"
+
+    def test_unchanged_key_is_not_rewritten(self, search_tool, tmp_path, monkeypatch):
+        """Test that configuring the stored key again skips the disk write"""
+        search_tool.config_path = str(tmp_path / "brave.json")
+        search_tool.configure("new-key")
+
+        def fail(*args):
+            raise AssertionError("config should not be rewritten")
+
+        monkeypatch.setattr(brave_search_tool.os, "replace", fail)
+
+        assert search_tool.configure("new-key") is True
+
+    def test_temp_file_is_synced_and_unique(self, search_tool, tmp_path, monkeypatch):
+        """Test that a uniquely named temp file is fsynced before the swap"""
+        search_tool.config_path = str(tmp_path / "brave.json")
+        (tmp_path / "brave.json.tmp").write_text("another writer")
+        events = []
+        real_fsync, real_replace = os.fsync, os.replace
+
+        def fsync(fd):
+            events.append("fsync")
+            real_fsync(fd)
+
+        def replace(src, dst):
+            events.append("replace")
+            assert os.path.dirname(src) == str(tmp_path)
+            real_replace(src, dst)
+
+        monkeypatch.setattr(brave_search_tool.os, "fsync", fsync)
+        monkeypatch.setattr(brave_search_tool.os, "replace", replace)
+
+        search_tool.configure("new-key")
+
+        assert events == ["fsync", "replace"]
+        assert (tmp_path / "brave.json.tmp").read_text() == "another writer"
+
+    def test_failed_write_leaves_no_temp_file(self, search_tool, tmp_path, monkeypatch):
+        """Test that a failed swap removes the temp file and keeps the old key"""
+        search_tool.config_path = str(tmp_path / "brave.json")
+
+        def fail(*args):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(brave_search_tool.os, "replace", fail)
+
+        with pytest.raises(OSError):
+            search_tool.configure("new-key")
+        assert os.listdir(tmp_path) == []
+        assert search_tool._stored_key != "new-key"
+
+
+class TestBatchForward:
+    """Offline tests for BraveSearchTool.batch_forward"""
+
+    def test_results_follow_query_order(self, search_tool, monkeypatch):
+        """Test that each result list lines up with its query"""
+
+        def get(url, **kwargs):
+            query = kwargs["params"]["q"]
+            item = {"title": query, "url": f"https://example.org/{query}"}
+            body = json.dumps({"web": {"results": [item]}}).encode()
+            return make_response(body)
+
+        monkeypatch.setattr(search_tool._session, "get", get)
+        queries = [f"query {i}" for i in range(12)]
+
+        results = search_tool.batch_forward(queries)
+
+        assert [r[0]["title"] for r in results] == queries
+        assert search_tool.batch_forward([]) == []
+
+    def test_forward_many_keeps_order_and_errors(self, search_tool, monkeypatch):
+        """Test that forward_many pairs each query with its results or its error"""
+
+        def get(url, **kwargs):
+            query = kwargs["params"]["q"]
+            if query == "broken":
+                return make_response(b"{}", status=500)
+            item = {"title": query, "url": f"https://example.org/{query}"}
+            return make_response(json.dumps({"web": {"results": [item]}}).encode())
+
+        monkeypatch.setattr(search_tool._session, "get", get)
+        queries = ["first", "broken", "third"]
+
+        outcomes = search_tool.forward_many(queries, max_workers=3)
+
+        assert [query for query, _ in outcomes] == queries
+        assert outcomes[0][1][0]["title"] == "first"
+        assert isinstance(outcomes[1][1], RuntimeError)
+        assert outcomes[2][1][0]["title"] == "third"
+
+
+class TestPickling:
+    """Offline tests for copying the tool between processes"""
+
+    def test_round_trip_reopens_clients(self, search_tool, fake_get):
+        """Test that an unpickled tool gets fresh clients and keeps its settings"""
+        search_tool.forward("smolagents")
+        key = ("smolagents", 10, "US", "en")
+        assert search_tool._cache.get(key) is not None
+
+        clone = pickle.loads(pickle.dumps(search_tool))
+        try:
+            assert clone.api_key == "test-key"
+            assert clone.transport == search_tool.transport
+            assert clone._session is not search_tool._session
+            assert clone._cache.maxsize == search_tool._cache.maxsize
+            assert clone._cache.get(key) is None
+        finally:
+            clone.close()
+
+    def test_ttl_cache_round_trip(self):
+        """Test that a pickled cache keeps its limits but starts empty"""
+        cache = _TTLCache(maxsize=3, ttl=30)
+        cache.set("a", 1)
+
+        clone = pickle.loads(pickle.dumps(cache))
+
+        assert (clone.maxsize, clone.ttl) == (3, 30)
+        assert clone.get("a") is None
+        clone.set("b", 2)
+        assert clone.get("b") == 2
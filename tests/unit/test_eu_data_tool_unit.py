@@ -0,0 +1,368 @@
+import os
+import time
+
+import pytest
+
+from smolagents_helpers import eu_data_tool
+from smolagents_helpers.eu_data_tool import (
+    EUDataTool,
+    _CONTENT_FORMAT_ALIASES,
+    _MULTI_VALUE_SEPARATOR,
+    _TokenBucket,
+    _atomic_write,
+    _build_alias_scanner,
+    _known_formats,
+    _matches_preferred_format,
+    _rate_limit_wait,
+)
+
+
+@pytest.fixture(params=["sqlite", "json"])
+def cache_tool(request, tmp_path):
+    """Fixture providing an EUDataTool on each cache backend, in an isolated directory"""
+    tool = EUDataTool(cache_dir=str(tmp_path / "cache"), cache_backend=request.param)
+    yield tool
+    tool.close()
+
+
+class TestCacheStore:
+    """Offline tests for the cache backends and their dataset index"""
+
+    def test_put_get_delete(self, cache_tool):
+        """Test a round trip through the cache"""
+        data = {"title": "Earnings", "keywords": ["wages", "income"]}
+
+        assert cache_tool._cache_put("key_a", data)
+        assert cache_tool._cache_get("key_a") == data
+        assert cache_tool._cache_delete("key_a")
+        assert cache_tool._cache_get("key_a") is None
+        assert not cache_tool._cache_delete("key_a")
+
+    def test_get_many(self, cache_tool):
+        """Test a batched read that skips missing and expired keys"""
+        cache_tool._cache_put("key_a", {"v": 1})
+        cache_tool._cache_put("key_b", {"v": 2})
+
+        assert cache_tool._cache_get_many([]) == {}
+        assert cache_tool._cache_get_many(["key_a", "key_b", "missing"]) == {
+            "key_a": {"v": 1},
+            "key_b": {"v": 2},
+        }
+        cache_tool.cache_ttl = 0
+        assert cache_tool._cache_get_many(["key_a", "key_b"]) == {}
+
+    def test_expired_entry_is_not_returned(self, cache_tool):
+        """Test that an entry older than the TTL reads as a miss"""
+        cache_tool._cache_put("key_a", {"v": 1})
+        cache_tool.cache_ttl = 0
+
+        assert cache_tool._cache_get("key_a") is None
+
+    def test_expired_entry_keeps_validators(self, cache_tool):
+        """Test that an expired entry is not returned but can be revalidated"""
+        cache_tool._cache_put("key_a", {"v": 1}, validators={"etag": '"abc"'})
+        cache_tool.cache_ttl = 0
+
+        assert cache_tool._cache_get("key_a") is None
+        assert cache_tool._cache_validators("key_a") == {"etag": '"abc"'}
+
+        cache_tool.cache_ttl = 60
+        assert cache_tool._cache_refresh("key_a") == {"v": 1}
+
+    def test_index_pop_returns_scope_entries(self, cache_tool):
+        """Test that indexed names are returned once per dataset, without duplicates"""
+        cache_tool._cache_put("key_a", {"v": 1}, scope="dataset_1")
+        cache_tool._cache_put("key_a", {"v": 2}, scope="dataset_1")
+        cache_tool._index_add("dataset_1", ("content_a.csv",))
+        cache_tool._cache_put("key_b", {"v": 2}, scope="dataset_2")
+
+        assert cache_tool._index_pop(["dataset_1"]) == {"key_a", "content_a.csv"}
+        assert cache_tool._index_pop(["dataset_1"]) == set()
+        assert cache_tool._index_pop(["dataset_2"]) == {"key_b"}
+
+    def test_json_index_has_no_duplicate_rows(self, tmp_path):
+        """Test that refetching a dataset does not grow the json backend's index"""
+        tool = EUDataTool(cache_dir=str(tmp_path), cache_backend="json")
+        try:
+            for _ in range(3):
+                tool._cache_put("key_a", {"v": 1}, scope="dataset_1")
+                tool._index_add("dataset_1", ("content_a.csv",))
+        finally:
+            tool.close()
+
+        with open(tmp_path / EUDataTool.CACHE_INDEX_NAME, encoding="utf-8") as f:
+            assert f.read().splitlines() == [
+                "dataset_1\tkey_a",
+                "dataset_1\tcontent_a.csv",
+            ]
+
+    def test_sqlite_delete_drops_index_rows(self, tmp_path):
+        """Test that deleting an entry leaves no orphaned index rows"""
+        tool = EUDataTool(cache_dir=str(tmp_path), cache_backend="sqlite")
+        try:
+            tool._cache_put("key_a", {"v": 1}, scope="dataset_1")
+            tool._cache_delete("key_a")
+
+            count = tool._db.execute("SELECT COUNT(*) FROM cache_index").fetchone()[0]
+            assert count == 0
+        finally:
+            tool.close()
+
+    def test_unknown_backend_is_rejected(self, tmp_path):
+        """Test that an unsupported cache backend raises ValueError"""
+        with pytest.raises(ValueError, match="Unsupported cache backend"):
+            EUDataTool(cache_dir=str(tmp_path), cache_backend="redis")
+
+
+class TestSanitizeFilename:
+    """Offline tests for turning URIs and keys into cache filenames"""
+
+    def test_separators_and_schemes(self, tmp_path):
+        """Test that URI separators become "_" and schemes are stripped anywhere"""
+        tool = EUDataTool(cache_enabled=False, cache_dir=str(tmp_path))
+
+        assert (
+            tool._sanitize_filename(
+                "metadata_http://data.europa.eu/88u/dataset/a?x=1&y"
+            )
+            == "metadata_data.europa.eu_88u_dataset_a_x_1_y"
+        )
+        assert tool._sanitize_filename("https://ex.org/café #1") == "ex.org_café1"
+        assert len(tool._sanitize_filename("a" * 300)) == 150
+
+
+class TestFormatMatching:
+    """Offline tests for the format alias scanner and preferred format checks"""
+
+    def test_alias_scanner_format_and_media_type(self):
+        """Test that markers are looked up on their own side only"""
+        scan = _build_alias_scanner(_CONTENT_FORMAT_ALIASES)
+
+        assert scan("JSON-LD", "") == {"RDF"}
+        assert scan("", "APPLICATION/JSON") == {"JSON"}
+        assert scan("COMMA-SEPARATED VALUES", "TEXT/CSV") == {"CSV"}
+        assert scan("OWL", "") == {"RDF"}
+        # A media type marker in the format field is not an alias match
+        assert scan("CSV", "") == frozenset()
+        assert scan("", "") == frozenset()
+
+    def test_alias_scanner_overlapping_markers(self):
+        """Test that a marker that is a prefix of a longer one still matches"""
+        scan = _build_alias_scanner({"A": (("JSON",), ()), "B": (("JSON-LD",), ())})
+
+        assert scan("JSON-LD", "") == {"A", "B"}
+        assert scan("JSON", "") == {"A"}
+
+    def test_format_url_and_alias_matches(self):
+        """Test the format field, the URL file name and the alias formats"""
+        rdf = frozenset({"RDF"})
+
+        assert _matches_preferred_format("CSV", "TEXT/CSV", "", frozenset())
+        assert _matches_preferred_format("CSV", "", "report.csv", frozenset())
+        assert _matches_preferred_format("JSON", "", "data?format=json", frozenset())
+        assert _matches_preferred_format("RDF", "TURTLE", "", rdf)
+        assert not _matches_preferred_format("JSON", "XML", "data.xml", rdf)
+
+    def test_known_formats_and_preferred_match(self):
+        """Test format tokens, URL extensions and the substring fallback"""
+        url_tail = "report.csv"
+        known = _known_formats("HTTP://EU/FILE-TYPE/XLSX", url_tail, frozenset({"RDF"}))
+
+        assert {"XLSX", "CSV", "RDF"} <= known
+        assert _matches_preferred_format("CSV", "", url_tail, known)
+        assert _matches_preferred_format("XLS", "HTTP://EU/FILE-TYPE/XLSX", "", known)
+        assert _known_formats("", "", frozenset()) == frozenset()
+
+
+class TestRateLimiting:
+    """Offline tests for the token bucket and rate limit header parsing"""
+
+    def test_rate_limit_wait_headers(self):
+        """Test Retry-After and X-RateLimit-* parsing"""
+        assert _rate_limit_wait({"Retry-After": "3"}) == 3.0
+        assert _rate_limit_wait({"Retry-After": "-1"}) == 0.0
+        assert _rate_limit_wait({"Retry-After": "Thu, 01 Jan 1970 00:00:00 GMT"}) == 0.0
+        assert _rate_limit_wait({"Retry-After": "soon"}) is None
+        assert (
+            _rate_limit_wait({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "5"})
+            == 5.0
+        )
+        epoch_reset = str(time.time() + 60)
+        wait = _rate_limit_wait(
+            {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": epoch_reset}
+        )
+        assert 0 < wait <= 60
+        assert _rate_limit_wait({"X-RateLimit-Remaining": "4"}) is None
+        assert _rate_limit_wait({}) is None
+
+    def test_token_bucket_burst_then_throttle(self):
+        """Test that a full bucket allows a burst and then spaces requests"""
+        bucket = _TokenBucket(rate=20, capacity=2)
+        start = time.monotonic()
+        bucket.acquire()
+        bucket.acquire()
+        assert bucket._tokens < 1  # The burst used up the bucket
+        bucket.acquire()
+        assert time.monotonic() - start >= 0.04
+
+    def test_token_bucket_pause(self):
+        """Test that pause holds back callers even with tokens left"""
+        bucket = _TokenBucket(rate=1000, capacity=5)
+        bucket.pause(0.1)
+        start = time.monotonic()
+        bucket.acquire()
+        assert time.monotonic() - start >= 0.09
+
+
+class TestAtomicWrite:
+    """Offline tests for atomic cache file writes"""
+
+    @pytest.fixture(params=["tmpfile", "named"])
+    def write_path(self, request, monkeypatch):
+        """Fixture running a test on the O_TMPFILE path and on the named temp file path"""
+        if request.param == "named":
+            monkeypatch.setattr(eu_data_tool, "_CAN_LINK_TMPFILE", False)
+        return request.param
+
+    def test_writes_bytes_and_chunks(self, tmp_path, write_path):
+        """Test writing a bytes payload, then replacing it with streamed chunks"""
+        path = str(tmp_path / "entry.json")
+        _atomic_write(path, b"old")
+        _atomic_write(path, iter([b"n", b"ew"]))
+
+        with open(path, "rb") as f:
+            assert f.read() == b"new"
+        assert os.listdir(tmp_path) == ["entry.json"]
+
+    def test_failed_write_keeps_old_file(self, tmp_path, write_path):
+        """Test that an error mid-stream leaves the previous file and no temp file"""
+        path = str(tmp_path / "entry.json")
+        _atomic_write(path, b"old")
+
+        def broken_chunks():
+            yield b"partial"
+            raise IOError("connection dropped")
+
+        with pytest.raises(IOError, match="connection dropped"):
+            _atomic_write(path, broken_chunks())
+
+        with open(path, "rb") as f:
+            assert f.read() == b"old"
+        assert os.listdir(tmp_path) == ["entry.json"]
+
+
+class TestJsonLdValues:
+    """Offline tests for reading values out of JSON-LD nodes"""
+
+    NODE = {
+        "dct:title": [
+            {"@value": "Verdienste", "@language": "de"},
+            {"@value": "Earnings", "@language": "en"},
+            {"@value": "Gains", "@language": "fr"},
+        ],
+        "dcat:keyword": ["wages", {"@value": "income", "@language": "en"}],
+        "dct:publisher": {"@id": "http://eu/org/CSO"},
+    }
+
+    def test_preferred_locale_then_first_value(self, tmp_path):
+        """Test that the preferred language wins and the first value is the fallback"""
+        tool = EUDataTool(cache_enabled=False, cache_dir=str(tmp_path))
+
+        assert tool._get_value(self.NODE, "dct:title") == "Earnings"
+        assert tool._get_value(self.NODE, "dct:title", prefer_locale="fr") == "Gains"
+        assert tool._get_value(self.NODE, "dct:title", prefer_locale="ga") == (
+            "Verdienste"
+        )
+        assert tool._get_value(self.NODE, "dct:publisher") == "http://eu/org/CSO"
+        assert tool._get_value(self.NODE, "dct:missing") is None
+        assert tool._get_value(None, "dct:title") is None
+
+    def test_allow_list_collects_every_value(self, tmp_path):
+        """Test that allow_list returns all values whatever their language"""
+        tool = EUDataTool(cache_enabled=False, cache_dir=str(tmp_path))
+
+        assert tool._get_value(self.NODE, "dcat:keyword", allow_list=True) == [
+            "wages",
+            "income",
+        ]
+        assert tool._get_value(self.NODE, "dct:missing", allow_list=True) == []
+
+    def test_first_value_keeps_property_priority(self, tmp_path):
+        """Test that the first property holding a value wins over later ones"""
+        tool = EUDataTool(cache_enabled=False, cache_dir=str(tmp_path))
+        publisher = {
+            "foaf:name": "Central Statistics Office",
+            "skos:prefLabel": {"@value": "CSO", "@language": "en"},
+        }
+        properties = ("foaf:name", "skos:prefLabel", "rdfs:label")
+
+        assert tool._get_first_value(publisher, properties) == (
+            "Central Statistics Office"
+        )
+        labelled = {"skos:prefLabel": publisher["skos:prefLabel"]}
+        assert tool._get_first_value(labelled, properties) == "CSO"
+        assert tool._get_first_value({"rdfs:label": []}, properties) is None
+
+
+class TestSparqlFallback:
+    """Offline tests for the SPARQL metadata fallback, with the endpoint mocked"""
+
+    DATASET_URI = (
+        "http://data.europa.eu/88u/dataset/54336a93-2478-44fc-bb78-696c77cff5c2"
+    )
+
+    def test_multi_valued_properties_are_split(self, tmp_path, monkeypatch):
+        """Test that GROUP_CONCAT values are split on the separator, not on "|" """
+        tool = EUDataTool(cache_enabled=False, cache_dir=str(tmp_path))
+        keywords = _MULTI_VALUE_SEPARATOR.join(["wages|salaries", "", "income"])
+        responses = {
+            "scalars": {
+                "title": {"value": "Earnings"},
+                "publisherName": {"value": "Central Statistics Office"},
+            },
+            "multi": {
+                "keywords": {"value": keywords},
+                "themes": {"value": "http://eu/theme/ECON"},
+            },
+        }
+
+        def fake_fetch_sparql(query, cache_key_suffix):
+            if cache_key_suffix.startswith("sparql_dist_"):
+                return {"results": {"bindings": []}}
+            group = cache_key_suffix.rsplit("_", 1)[1]
+            return {"results": {"bindings": [responses[group]]}}
+
+        monkeypatch.setattr(tool, "_fetch_sparql", fake_fetch_sparql)
+        try:
+            metadata = tool._get_metadata_from_sparql_fallback(
+                self.DATASET_URI, force_refresh=False
+            )
+        finally:
+            tool.close()
+
+        assert metadata["title"] == "Earnings"
+        assert metadata["publisher"] == "Central Statistics Office"
+        assert metadata["keywords"] == ["wages|salaries", "income"]
+        assert metadata["themes"] == ["http://eu/theme/ECON"]
+        assert "languages" not in metadata
+        assert metadata["distributions"] == []
+
+    def test_multi_valued_properties_are_capped(self, tmp_path, monkeypatch):
+        """Test that a split multi-valued property keeps at most 200 values"""
+        tool = EUDataTool(cache_enabled=False, cache_dir=str(tmp_path))
+        keywords = _MULTI_VALUE_SEPARATOR.join(f"kw{i}" for i in range(250))
+
+        def fake_fetch_sparql(query, cache_key_suffix):
+            if cache_key_suffix.endswith("_multi"):
+                return {"results": {"bindings": [{"keywords": {"value": keywords}}]}}
+            return {"results": {"bindings": []}}
+
+        monkeypatch.setattr(tool, "_fetch_sparql", fake_fetch_sparql)
+        try:
+            metadata = tool._get_metadata_from_sparql_fallback(
+                self.DATASET_URI, force_refresh=False
+            )
+        finally:
+            tool.close()
+
+        assert metadata["keywords"] == [f"kw{i}" for i in range(200)]
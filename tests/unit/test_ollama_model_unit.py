@@ -0,0 +1,206 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from smolagents_helpers import ollama_model
+from smolagents_helpers.ollama_model import OllamaModel
+
+
+class FakeStream:
+    """Iterator over streamed chat chunks that records whether it was closed"""
+
+    def __init__(self, tokens):
+        self._chunks = iter(
+            {"message": {"role": "assistant", "content": token}} for token in tokens
+        )
+        self.consumed = 0
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        chunk = next(self._chunks)
+        self.consumed += 1
+        return chunk
+
+    def close(self):
+        self.closed = True
+
+
+class FakeClient:
+    """Stand-in for ollama.Client that streams back the last user message"""
+
+    def __init__(self):
+        self.calls = []
+        self.streams = []
+
+    def chat(self, model, messages, **kwargs):
+        self.calls.append({"model": model, "messages": messages, **kwargs})
+        text = messages[-1]["content"]
+        # Later prompts finish first, so the pool completes out of order
+        time.sleep(0.01 * (5 - len(text) % 5))
+        stream = FakeStream(["echo: ", *text.split(" ")])
+        self.streams.append(stream)
+        return stream
+
+
+class FakeAsyncStream:
+    """Async iterator over streamed chat chunks"""
+
+    def __init__(self, tokens):
+        self._tokens = iter(tokens)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            token = next(self._tokens)
+        except StopIteration:
+            raise StopAsyncIteration
+        return {"message": {"role": "assistant", "content": token}}
+
+    async def aclose(self):
+        pass
+
+
+class FakeAsyncClient:
+    """Stand-in for ollama.AsyncClient that remembers the loop it was used on"""
+
+    instances = []
+
+    def __init__(self):
+        self.loops = []
+        self.closed = False
+        FakeAsyncClient.instances.append(self)
+
+    async def chat(self, model, messages, **kwargs):
+        self.loops.append(asyncio.get_running_loop())
+        return FakeAsyncStream(["echo: ", messages[-1]["content"]])
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def model():
+    """Fixture providing an OllamaModel whose client is mocked"""
+    model = OllamaModel(model_name="test-model")
+    model.client = FakeClient()
+    return model
+
+
+class TestChat:
+    """Offline tests for streamed OllamaModel calls"""
+
+    def test_streamed_tokens_are_joined(self, model):
+        """Test that the streamed fragments make up the response"""
+        response = model(["one two three"])
+
+        assert response.content == "echo: onetwothree"
+        assert model.client.calls[0]["stream"] is True
+        assert model.client.streams[0].closed
+
+    def test_on_token_stops_early(self, model):
+        """Test that on_token returning False ends the generation"""
+        seen = []
+
+        def on_token(token):
+            seen.append(token)
+            return token != "two"
+
+        response = model(["one two three four"], on_token=on_token)
+
+        assert response.content == "echo: onetwo"
+        assert seen == ["echo: ", "one", "two"]
+        assert model.client.streams[0].consumed == 3
+        assert model.client.streams[0].closed
+
+    def test_stop_sequences_become_the_stop_option(self, model):
+        """Test that stop_sequences are sent as Ollama's stop option"""
+        model(["hello"], stop_sequences=["Observation:"])
+        model(["hello"])
+
+        assert model.client.calls[0]["options"] == {
+            "temperature": 0.7,
+            "stop": ["Observation:"],
+        }
+        assert "stop" not in model.client.calls[1]["options"]
+
+
+class TestBatchCall:
+    """Offline tests for OllamaModel.batch_call"""
+
+    def test_responses_follow_input_order(self, model):
+        """Test that each response lines up with its conversation"""
+        prompts = [f"prompt{'x' * i}" for i in range(10)]
+
+        responses = model.batch_call([[prompt] for prompt in prompts], max_workers=4)
+
+        assert [r.content for r in responses] == [f"echo: {p}" for p in prompts]
+        assert len(model.client.calls) == len(prompts)
+
+    def test_empty_batch(self, model):
+        """Test that an empty batch sends nothing"""
+        assert model.batch_call([]) == []
+        assert model.client.calls == []
+
+
+class TestAsyncCall:
+    """Offline tests for OllamaModel.acall, with the async client mocked"""
+
+    @pytest.fixture(autouse=True)
+    def fake_async_client(self, monkeypatch):
+        """Fixture replacing ollama.AsyncClient for the duration of a test"""
+        FakeAsyncClient.instances = []
+        monkeypatch.setattr(ollama_model.ollama, "AsyncClient", FakeAsyncClient)
+
+    def test_client_is_recreated_per_event_loop(self, model):
+        """Test that each asyncio.run gets a client bound to its own loop"""
+        first = asyncio.run(model.acall(["hello"]))
+        second = asyncio.run(model.acall(["again"]))
+
+        assert first.content == "echo: hello"
+        assert second.content == "echo: again"
+        old, new = FakeAsyncClient.instances
+        assert old is not new
+        assert old.loops[0] is not new.loops[0]
+        # Each client was closed when its asyncio.run finished
+        assert old.closed and new.closed
+        assert model._async_clients == {}
+
+    def test_client_is_reused_within_a_loop(self, model):
+        """Test that calls on one loop share a client"""
+
+        async def run_twice():
+            await model.acall(["one"])
+            await model.acall(["two"])
+            await model.aclose()
+
+        asyncio.run(run_twice())
+
+        (client,) = FakeAsyncClient.instances
+        assert len(client.loops) == 2
+        assert client.closed
+
+    def test_aclose_closes_clients_of_other_loops(self, model):
+        """Test that aclose closes a client whose loop runs in another thread"""
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        try:
+            asyncio.run_coroutine_threadsafe(model.acall(["hi"]), loop).result()
+            (client,) = FakeAsyncClient.instances
+            assert not client.closed
+
+            asyncio.run(model.aclose())
+
+            assert client.closed
+            assert model._async_clients == {}
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()